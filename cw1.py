@@ -1,7 +1,16 @@
 import sys
 import time
 import os
-from collections import deque
+import argparse
+import heapq
+import hashlib
+import mmap
+import shutil
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from itertools import chain
 
 # Kolory terminala
 RED = "\033[1;31m"
@@ -39,33 +48,246 @@ CELL_CONNECTIONS = {
 }
 
 
+# Dostępne algorytmy: BFS, DFS, A* (heurystyka Manhattan), dwukierunkowy BFS
+ALGORITHMS = ('BFS', 'DFS', 'ASTAR', 'BIBFS')
+
+# Bity masek połączeń, w kolejności DIRECTIONS
+UP, DOWN, RIGHT, LEFT = 1, 2, 4, 8
+DIRECTION_BITS = {'↑': UP, '↓': DOWN, '→': RIGHT, '←': LEFT}
+CELL_MASKS = {cell: sum(DIRECTION_BITS[d] for d in dirs) for cell, dirs in CELL_CONNECTIONS.items()}
+
+
+class _MaskTable(dict):
+    """Tablica dla str.translate: znaki spoza CELL_CONNECTIONS stają się ścianą (maska 0)."""
+
+    def __missing__(self, key):
+        return 0
+
+
+_CHAR_TO_MASK = _MaskTable({ord(cell): mask for cell, mask in CELL_MASKS.items()})
+_MASK_TO_CHAR = {mask: ord(cell) for cell, mask in CELL_MASKS.items()}
+
+# Ile pól przetwarzać naraz przy wyznaczaniu przejść
+_LINKS_CHUNK = 1 << 20
+
+
+def _links_from_masks(masks, width):
+    """Wyznacza maski przejść z masek pól (bajt na pole, wiersz po wierszu).
+
+    Kawałek mapy jest traktowany jako jedna duża liczba całkowita, a sprawdzenie
+    sąsiadów to przesunięcia o bajt (kolumna) lub o wiersz i iloczyny bitowe,
+    więc pętla po polach odbywa się w C, a nie w Pythonie.
+    """
+    size = len(masks)
+    height = size // width
+    links = bytearray(size)
+    rows_per_chunk = max(1, _LINKS_CHUNK // width)
+    row_bits = 8 * width
+
+    for r0 in range(0, height, rows_per_chunk):
+        r1 = min(r0 + rows_per_chunk, height)
+        # Dokładamy wiersz poniżej, żeby widzieć połączenia w dół przez granicę kawałka
+        r2 = r1 + 1 if r1 < height else r1
+        chunk = masks[r0 * width:r2 * width]
+        nbytes = len(chunk)
+
+        def repeat(byte):
+            return int.from_bytes(bytes((byte,)) * nbytes, 'little')
+
+        m = int.from_bytes(chunk, 'little')
+        not_last_col = int.from_bytes((b'\xff' * (width - 1) + b'\x00') * (r2 - r0), 'little')
+        right = m & repeat(RIGHT) & (((m >> 8) & repeat(LEFT)) >> 1) & not_last_col
+        down = m & repeat(DOWN) & (((m >> row_bits) & repeat(UP)) << 1)
+        chunk_links = right | (right << 9) | down | ((down << row_bits) >> 1)
+
+        current = int.from_bytes(links[r0 * width:r2 * width], 'little')
+        links[r0 * width:r2 * width] = (current | chunk_links).to_bytes(nbytes, 'little')
+
+    return links
+
+
+def _masks_from_rows(rows):
+    return b''.join(''.join(row).translate(_CHAR_TO_MASK).encode('latin-1') for row in rows)
+
+
+def compile_links(lab):
+    """Buduje tablicę 4-bitowych masek przejść dla pól numerowanych wiersz * szerokość + kolumna.
+
+    Bit kierunku jest ustawiony tylko wtedy, gdy sąsiad leży w granicach mapy
+    i oba pola są ze sobą połączone, więc wyszukiwanie nie musi już niczego sprawdzać.
+    """
+    return _links_from_masks(_masks_from_rows(lab), len(lab[0]))
+
+
+class Maze:
+    """Labirynt: maski pól (bajt na pole) i prekompilowane maski przejść.
+
+    Wiersze znaków do rysowania są odtwarzane z masek dopiero przy odczycie,
+    chyba że labirynt zbudowano z gotowych wierszy.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.width = len(rows[0])
+        self.height = len(rows)
+        self.masks = _masks_from_rows(rows)
+        self.links = _links_from_masks(self.masks, self.width)
+
+    @classmethod
+    def from_masks(cls, masks, width):
+        maze = cls.__new__(cls)
+        maze.rows = None
+        maze.width = width
+        maze.height = len(masks) // width
+        maze.masks = masks
+        maze.links = _links_from_masks(masks, width)
+        return maze
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, i):
+        if self.rows is not None:
+            return self.rows[i]
+        if not -self.height <= i < self.height:
+            raise IndexError(i)
+        start = (i % self.height) * self.width
+        return self.masks[start:start + self.width].decode('latin-1').translate(_MASK_TO_CHAR)
+
+    def __iter__(self):
+        return (self[i] for i in range(self.height))
+
+    @cached_property
+    def key(self):
+        """Skrót mapy używany jako klucz pamięci podręcznej pól odległości."""
+        return _map_key(self.width, self.links)
+
+
 def read_map(path):
-    with open(path, encoding='utf-8') as f:
-        lines = [list(line.rstrip('\n')) for line in f.readlines()]
-    max_len = max(len(l) for l in lines)
-    for l in lines:
-        while len(l) < max_len:
-            l.append(' ')
-    return lines
+    """Wczytuje mapę przez mmap, dekodując ją wiersz po wierszu do masek pól.
+
+    Na pole przypada jeden bajt, a krótsze wiersze są dopełniane ścianą dopiero
+    przy składaniu tablicy. Znaki spoza CELL_CONNECTIONS traktowane są jak
+    ściany i rysowane jako spacje.
+    """
+    rows = []
+    width = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos, size = 0, len(mm)
+        while pos < size:
+            nl = mm.find(b'\n', pos)
+            if nl < 0:
+                nl = size
+            row = mm[pos:nl].decode('utf-8').translate(_CHAR_TO_MASK).encode('latin-1')
+            rows.append(row)
+            width = max(width, len(row))
+            pos = nl + 1
+    return Maze.from_masks(b''.join(row.ljust(width, b'\0') for row in rows), width)
 
 
 def draw_map(lab, visited=set(), queue=set(), start=None, end=None):
+    lines = []
     for i, row in enumerate(lab):
-        for j, cell in enumerate(row):
-            char = cell
+        line = []
+        for j, char in enumerate(row):
             pos = (i, j)
             if pos == start:
-                print(RED + char + RESET, end='')
+                line.append(RED + char + RESET)
             elif pos == end:
-                print(BLUE + char + RESET, end='')
+                line.append(BLUE + char + RESET)
             elif pos in visited:
-                print(GREEN + char + RESET, end='')
+                line.append(GREEN + char + RESET)
             elif pos in queue:
-                print(YELLOW + char + RESET, end='')
+                line.append(YELLOW + char + RESET)
+            else:
+                line.append(char)
+        lines.append(''.join(line))
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+
+class TerminalRenderer:
+    """Animacja mapy w terminalu przerysowująca tylko pola, które zmieniły kolor.
+
+    Pierwsza klatka jest wypisywana w całości, kolejne to sekwencje ANSI
+    przesuwające kursor do zmienionych pól. Gdy mapa nie mieści się w oknie
+    terminala (za wysoka albo za szeroka), każda klatka jest wypisywana
+    w całości (jednym zapisem). `fps` ogranicza liczbę klatek na sekundę
+    (0 - bez ograniczenia): klatki przychodzące za wcześnie są pomijane,
+    a przeszukiwanie nigdy nie czeka na rysowanie.
+    """
+
+    # Kolor pola: zwykłe, odwiedzone, w kolejce, start, cel
+    PLAIN, VISITED, QUEUED, START, END = range(5)
+    COLORS = ('', GREEN, YELLOW, RED, BLUE)
+
+    def __init__(self, lab, start=None, end=None, fps=10, out=None):
+        self.rows = [''.join(row) for row in lab]
+        self.height = len(self.rows)
+        self.width = len(self.rows[0])
+        self.start = start[0] * self.width + start[1] if start is not None else None
+        self.end = end[0] * self.width + end[1] if end is not None else None
+        self.fps = fps
+        self.out = out or sys.stdout
+        self.state = None
+        self.last_frame = 0.0
+
+    def _state(self, visited, queue):
+        state = bytearray(visited)
+        for i in queue:
+            if not state[i]:
+                state[i] = self.QUEUED
+        if self.start is not None:
+            state[self.start] = self.START
+        if self.end is not None:
+            state[self.end] = self.END
+        return state
+
+    def _full_frame(self, state):
+        w = self.width
+        lines = []
+        for x, row in enumerate(self.rows):
+            codes = state[x * w:(x + 1) * w]
+            if codes.count(0) == w:
+                lines.append(row)
             else:
-                print(char, end='')
-        print()
-    time.sleep(0.1)
+                lines.append(''.join(self.COLORS[c] + ch + RESET if c else ch for c, ch in zip(codes, row)))
+        return '\n'.join(lines) + '\n'
+
+    def _diff_frame(self, state):
+        w, h, prev = self.width, self.height, self.state
+        parts = []
+        for x in range(h):
+            a = x * w
+            if state[a:a + w] == prev[a:a + w]:
+                continue
+            # Kursor stoi pod mapą: w górę do wiersza x, zmienione pola, z powrotem w dół
+            up = h - x
+            parts.append(f"\033[{up}F")
+            row = self.rows[x]
+            for y in range(w):
+                c = state[a + y]
+                if c != prev[a + y]:
+                    parts.append(f"\033[{y + 1}G{self.COLORS[c]}{row[y]}{RESET}")
+            parts.append(f"\033[{up}E")
+        return ''.join(parts)
+
+    def render(self, visited, queue=(), force=False):
+        """Rysuje klatkę; bez `force` pomija ją, jeśli od poprzedniej minęło mniej niż 1/fps s."""
+        if not force and self.fps and self.state is not None and \
+                time.perf_counter() - self.last_frame < 1 / self.fps:
+            return
+        state = self._state(visited, queue)
+        terminal = shutil.get_terminal_size()
+        if self.state is None or self.height >= terminal.lines or self.width > terminal.columns:
+            frame = self._full_frame(state)
+        else:
+            frame = self._diff_frame(state)
+
+        self.out.write(frame)
+        self.out.flush()
+        self.last_frame = time.perf_counter()
+        self.state = state
 
 
 def valid_move(lab, x, y, nx, ny, dx, dy):
@@ -88,55 +310,380 @@ def valid_move(lab, x, y, nx, ny, dx, dy):
     return move_dir in CELL_CONNECTIONS[curr] and opposite in CELL_CONNECTIONS[nextc]
 
 
-def search(lab, start, end, algorithm='BFS'):
-    visited = set()
-    queue = deque([(start, [start])])
+class MapObserver:
+    """Rysuje stan przeszukiwania co `every` kroków."""
+
+    def __init__(self, lab, start, end, every=1, fps=10):
+        self.renderer = TerminalRenderer(lab, start, end, fps)
+        self.every = every
+        self.visited = bytearray()
+
+    def __call__(self, steps, visited, queue):
+        self.visited = visited
+        if steps % self.every == 0:
+            self.renderer.render(visited, queue)
+
+    def finish(self):
+        self.renderer.render(self.visited, force=True)
+
+
+def _build_path(parent, idx, width):
+    """Odtwarza ścieżkę od startu do `idx` po wskaźnikach na rodzica."""
+    path = []
+    while True:
+        path.append(divmod(idx, width))
+        prev = parent[idx]
+        if prev == idx:
+            break
+        idx = prev
+    path.reverse()
+    return path
+
+
+def _queue_search(links, moves, width, start_idx, end_idx, observer, dfs):
+    """BFS (kolejka) lub DFS (stos) z jednym wspólnym kodem."""
+    size = len(links)
+    visited = bytearray(size)
+    parent = array('i', [-1]) * size
+    parent[start_idx] = start_idx
+    queue = deque([start_idx])
     steps = 0
+    visited_count = 0
 
     while queue:
-        draw_map(lab, visited, {p for p, _ in queue}, start, end)
-        if algorithm.upper() == 'DFS':
-            pos, path = queue.pop()
+        if observer is not None:
+            observer(steps, visited, queue)
+        if dfs:
+            idx = queue.pop()
         else:
-            pos, path = queue.popleft()
+            idx = queue.popleft()
 
         steps += 1
-        if pos == end:
-            draw_map(lab, visited, set(), start, end)
-            print(GREEN + f"\nZnaleziono ścieżkę! Kroki: {steps}" + RESET)
-            return path
+        if idx == end_idx:
+            return _build_path(parent, idx, width), steps, visited_count
 
-        if pos in visited:
+        if visited[idx]:
             continue
 
-        visited.add(pos)
-        x, y = pos
-        for d, (dx, dy) in DIRECTIONS.items():
-            nx, ny = x + dx, y + dy
-            if valid_move(lab, x, y, nx, ny, dx, dy) and (nx, ny) not in visited:
-                queue.append(((nx, ny), path + [(nx, ny)]))
+        visited[idx] = 1
+        visited_count += 1
+        m = links[idx]
+        for bit, offset in moves:
+            if m & bit:
+                n = idx + offset
+                if not visited[n]:
+                    # BFS zdejmie najpierw pierwszy wpis danego pola, DFS - ostatni
+                    if dfs or parent[n] < 0:
+                        parent[n] = idx
+                    queue.append(n)
 
-    draw_map(lab, visited, set(), start, end)
-    print(RED + f"\nNie znaleziono ścieżki po {steps} krokach." + RESET)
-    return None
+    return None, steps, visited_count
+
+
+def _astar_search(links, moves, width, start_idx, end_idx, observer):
+    """A* z heurystyką Manhattan; przy równym f wybiera pole bliższe celu."""
+    size = len(links)
+    ex, ey = divmod(end_idx, width)
+    visited = bytearray(size)
+    parent = array('i', [-1]) * size
+    g = array('i', [-1]) * size
+    parent[start_idx] = start_idx
+    g[start_idx] = 0
+    sx, sy = divmod(start_idx, width)
+    h = abs(sx - ex) + abs(sy - ey)
+    heap = [(h, h, start_idx)]
+    steps = 0
+    visited_count = 0
+
+    while heap:
+        if observer is not None:
+            observer(steps, visited, (i for _, _, i in heap))
+        _, _, idx = heapq.heappop(heap)
+
+        steps += 1
+        if idx == end_idx:
+            return _build_path(parent, idx, width), steps, visited_count
+
+        if visited[idx]:
+            continue
+
+        visited[idx] = 1
+        visited_count += 1
+        next_g = g[idx] + 1
+        m = links[idx]
+        for bit, offset in moves:
+            if m & bit:
+                n = idx + offset
+                if not visited[n] and (g[n] < 0 or next_g < g[n]):
+                    g[n] = next_g
+                    parent[n] = idx
+                    x, y = divmod(n, width)
+                    h = abs(x - ex) + abs(y - ey)
+                    heapq.heappush(heap, (next_g + h, h, n))
+
+    return None, steps, visited_count
+
+
+def _bidirectional_search(links, moves, width, start_idx, end_idx, observer):
+    """BFS prowadzony jednocześnie od startu i od celu, poziomami.
+
+    Zawsze rozwijany jest mniejszy z dwóch frontów; pierwsze pole odkryte
+    przez obie strony wyznacza najkrótszą ścieżkę.
+    """
+    size = len(links)
+    visited = bytearray(size)
+    parents = (array('i', [-1]) * size, array('i', [-1]) * size)
+    parents[0][start_idx] = start_idx
+    parents[1][end_idx] = end_idx
+    frontiers = [[start_idx], [end_idx]]
+    steps = 0
+    visited_count = 0
+
+    if start_idx == end_idx:
+        return [divmod(start_idx, width)], 1, 0
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = parents[side], parents[1 - side]
+        next_level = []
+        for idx in frontiers[side]:
+            if observer is not None:
+                observer(steps, visited, chain(frontiers[0], frontiers[1], next_level))
+            steps += 1
+            visited[idx] = 1
+            visited_count += 1
+            m = links[idx]
+            for bit, offset in moves:
+                if m & bit:
+                    n = idx + offset
+                    if other[n] >= 0:
+                        a, b = (idx, n) if side == 0 else (n, idx)
+                        path = _build_path(parents[0], a, width) + _build_path(parents[1], b, width)[::-1]
+                        return path, steps, visited_count
+                    if own[n] < 0:
+                        own[n] = idx
+                        next_level.append(n)
+        frontiers[side] = next_level
+
+    return None, steps, visited_count
+
+
+def _cell_index(point, width, height):
+    """Numer pola (wiersz * szerokość + kolumna); ValueError, gdy pole leży poza mapą."""
+    row, col = point
+    if not (0 <= row < height and 0 <= col < width):
+        raise ValueError(f"Pole ({row}, {col}) leży poza mapą {height}x{width}.")
+    return row * width + col
+
+
+def solve(lab, start, end, algorithm='BFS', observer=None):
+    """Przeszukuje labirynt bez wypisywania czegokolwiek na terminal.
+
+    `algorithm` to jedna z ALGORITHMS. Zwraca krotkę (ścieżka, kroki, liczba
+    odwiedzonych pól); ścieżka to None, jeśli cel jest nieosiągalny, a kroki to
+    liczba pobrań z kolejki w każdym z algorytmów. Pola są numerowane jako
+    wiersz * szerokość + kolumna, kolejka trzyma same numery, a ścieżka jest
+    odtwarzana z tablicy rodziców dopiero po dotarciu do celu. `observer` jest
+    wywoływany przed każdym pobraniem jako observer(kroki, odwiedzone, kolejka).
+    """
+    algorithm = algorithm.upper()
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Nieznany algorytm: {algorithm}. Dostępne: {', '.join(ALGORITHMS)}.")
+
+    width = len(lab[0])
+    links = lab.links if isinstance(lab, Maze) else compile_links(lab)
+    moves = ((UP, -width), (DOWN, width), (RIGHT, 1), (LEFT, -1))
+    start_idx = _cell_index(start, width, len(lab))
+    end_idx = _cell_index(end, width, len(lab))
+
+    if algorithm == 'ASTAR':
+        return _astar_search(links, moves, width, start_idx, end_idx, observer)
+    if algorithm == 'BIBFS':
+        return _bidirectional_search(links, moves, width, start_idx, end_idx, observer)
+    return _queue_search(links, moves, width, start_idx, end_idx, observer, algorithm == 'DFS')
+
+
+# Liczba tablic rodziców trzymanych w pamięci (każda zajmuje 4 bajty na pole mapy)
+FIELD_CACHE_SIZE = 16
+_field_cache = OrderedDict()
+
+
+def _map_key(width, links):
+    return width, hashlib.blake2b(links, digest_size=16).hexdigest()
+
+
+def parent_field(links, width, source_idx):
+    """BFS z jednego pola po całej mapie; zwraca tablicę rodziców (-1 = pole nieosiągalne)."""
+    moves = ((UP, -width), (DOWN, width), (RIGHT, 1), (LEFT, -1))
+    parent = array('i', [-1]) * len(links)
+    parent[source_idx] = source_idx
+    queue = deque([source_idx])
+    while queue:
+        idx = queue.popleft()
+        m = links[idx]
+        for bit, offset in moves:
+            if m & bit:
+                n = idx + offset
+                if parent[n] < 0:
+                    parent[n] = idx
+                    queue.append(n)
+    return parent
+
+
+_worker_map = None
+
+
+def _init_worker(links, width):
+    global _worker_map
+    _worker_map = (links, width)
+
+
+def _worker_field(source_idx):
+    links, width = _worker_map
+    return source_idx, parent_field(links, width, source_idx)
+
+
+def batch_solve(lab, queries, processes=None):
+    """Odpowiada na listę zapytań (start, koniec) o najkrótsze ścieżki.
+
+    Dla każdego unikalnego startu liczony jest jeden BFS po całej mapie, a jego
+    tablica rodziców trafia do pamięci LRU (klucz: skrót mapy i start), więc
+    kolejne zapytania z tego samego startu kosztują tylko odtworzenie ścieżki.
+    Przy `processes` > 1 brakujące pola są liczone równolegle w puli procesów.
+    Zwraca listę ścieżek (None, gdy cel jest nieosiągalny) w kolejności zapytań.
+    """
+    if isinstance(lab, Maze):
+        width, links, key = lab.width, lab.links, lab.key
+    else:
+        width, links = len(lab[0]), compile_links(lab)
+        key = _map_key(width, links)
+
+    height = len(links) // width
+    indices = [(_cell_index(start, width, height), _cell_index(end, width, height)) for start, end in queries]
+    by_source = {}
+    for i, (start_idx, _) in enumerate(indices):
+        by_source.setdefault(start_idx, []).append(i)
+
+    results = [None] * len(indices)
+
+    def answer(source, field):
+        for i in by_source[source]:
+            end_idx = indices[i][1]
+            if field[end_idx] >= 0:
+                results[i] = _build_path(field, end_idx, width)
+
+    missing = []
+    for source in by_source:
+        field = _field_cache.get((key, source))
+        if field is None:
+            missing.append(source)
+        else:
+            _field_cache.move_to_end((key, source))
+            answer(source, field)
+
+    def remember(source, field):
+        _field_cache[(key, source)] = field
+        if len(_field_cache) > FIELD_CACHE_SIZE:
+            _field_cache.popitem(last=False)
+
+    # Każda policzona tablica jest od razu zużywana i trafia tylko do pamięci LRU,
+    # więc naraz w pamięci jest najwyżej FIELD_CACHE_SIZE + `processes` tablic.
+    if processes and processes > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(links, width)) as pool:
+            for first in range(0, len(missing), processes):
+                for source, field in pool.map(_worker_field, missing[first:first + processes]):
+                    answer(source, field)
+                    remember(source, field)
+    else:
+        for source in missing:
+            field = parent_field(links, width, source)
+            answer(source, field)
+            remember(source, field)
+    return results
+
+
+def search(lab, start, end, algorithm='BFS', every=1, fps=10):
+    """Przeszukuje labirynt z animacją rysowaną co `every` kroków (0 wyłącza rysowanie).
+
+    `fps` to limit klatek animacji na sekundę (0 - bez ograniczenia).
+    """
+    observer = MapObserver(lab, start, end, every, fps) if every else None
+    path, steps, _ = solve(lab, start, end, algorithm, observer)
+    if observer is not None:
+        observer.finish()
+
+    if path is not None:
+        print(GREEN + f"\nZnaleziono ścieżkę! Kroki: {steps}" + RESET)
+    else:
+        print(RED + f"\nNie znaleziono ścieżki po {steps} krokach." + RESET)
+    return path
+
+
+def check_points(parser, lab, *points):
+    """Kończy program komunikatem, jeśli któryś punkt nie jest parą współrzędnych pola mapy."""
+    for point in points:
+        try:
+            _cell_index(point, len(lab[0]), len(lab))
+        except ValueError as e:
+            message = str(e) if len(point) == 2 else f"Współrzędne muszą mieć postać 'wiersz kolumna', podano: {point}."
+            parser.error(message)
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("Użycie: python labirynt.py <ścieżka_do_mapy>")
+    parser = argparse.ArgumentParser(description="Wyszukiwanie ścieżki w labiryncie.")
+    parser.add_argument('mapa', help="ścieżka do pliku z mapą")
+    parser.add_argument('--start', nargs=2, type=int, metavar=('WIERSZ', 'KOLUMNA'))
+    parser.add_argument('--end', nargs=2, type=int, metavar=('WIERSZ', 'KOLUMNA'))
+    parser.add_argument('--algorithm', type=str.upper, choices=ALGORITHMS)
+    parser.add_argument('--headless', action='store_true',
+                        help="tylko wynik, bez rysowania mapy (wymaga --start i --end)")
+    parser.add_argument('--batch', metavar='PLIK',
+                        help="plik z zapytaniami 'w1 k1 w2 k2' w kolejnych liniach; wypisuje długości ścieżek")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="liczba procesów do liczenia pól odległości w trybie --batch")
+    parser.add_argument('--every', type=int, default=1,
+                        help="rysuj mapę co N kroków, 0 wyłącza animację (domyślnie 1)")
+    parser.add_argument('--fps', type=float, default=10,
+                        help="maksymalna liczba klatek animacji na sekundę, 0 bez limitu (domyślnie 10)")
+    args = parser.parse_args()
+
+    lab = read_map(args.mapa)
+
+    if args.batch:
+        with open(args.batch, encoding='utf-8') as f:
+            queries = [((r1, c1), (r2, c2)) for r1, c1, r2, c2 in
+                       (map(int, line.split()) for line in f if line.strip())]
+        try:
+            paths = batch_solve(lab, queries, args.processes)
+        except ValueError as e:
+            parser.error(str(e))
+        for (start, end), path in zip(queries, paths):
+            length = len(path) - 1 if path else -1
+            print(f"{start[0]} {start[1]} {end[0]} {end[1]} {length}")
+        return
+
+    if args.headless:
+        if args.start is None or args.end is None:
+            parser.error("tryb --headless wymaga podania --start i --end")
+        check_points(parser, lab, args.start, args.end)
+        path, steps, visited = solve(lab, tuple(args.start), tuple(args.end), args.algorithm or 'BFS')
+        print(f"kroki={steps} odwiedzone={visited} dlugosc={len(path) if path else 0}")
+        print(' '.join(f"{x},{y}" for x, y in path) if path else "brak ścieżki")
         return
 
-    path = sys.argv[1]
-    lab = read_map(path)
     draw_map(lab)
 
-    start = tuple(map(int, input("Podaj współrzędne startowe (wiersz kolumna): ").split()))
-    end = tuple(map(int, input("Podaj współrzędne końcowe (wiersz kolumna): ").split()))
-    alg = input("Wybierz algorytm (BFS/DFS): ").strip().upper()
-    if alg not in ('BFS', 'DFS'):
+    try:
+        start = tuple(args.start) if args.start else tuple(map(int, input("Podaj współrzędne startowe (wiersz kolumna): ").split()))
+        end = tuple(args.end) if args.end else tuple(map(int, input("Podaj współrzędne końcowe (wiersz kolumna): ").split()))
+    except ValueError:
+        parser.error("Współrzędne muszą być liczbami całkowitymi.")
+    check_points(parser, lab, start, end)
+    alg = args.algorithm or input(f"Wybierz algorytm ({'/'.join(ALGORITHMS)}): ").strip().upper()
+    if alg not in ALGORITHMS:
         alg = 'BFS'
 
-    search(lab, start, end, alg)
+    search(lab, start, end, alg, args.every, args.fps)
 
 
 if __name__ == "__main__":
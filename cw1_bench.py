@@ -0,0 +1,142 @@
+import argparse
+import random
+import time
+import tracemalloc
+from collections import deque
+
+import cw1
+
+# Największy bok labiryntu, dla którego domyślnie mierzymy poprzednią wersję: kopiowanie
+# ścieżek kosztuje O(kolejka x długość ścieżki), przy 700x700 to już ok. minuty na przebieg.
+OLD_SOLVER_MAX_SIZE = 500
+
+# Znak pola dla każdego zestawu kierunków
+CHAR_FOR_CONNECTIONS = {frozenset(dirs): char for char, dirs in cw1.CELL_CONNECTIONS.items()}
+OPPOSITE = {'↑': '↓', '↓': '↑', '→': '←', '←': '→'}
+
+
+def generate_maze(rows, cols, extra=0.0, seed=None):
+    """Generuje labirynt ze znaków ramek (iteracyjny DFS z powrotami).
+
+    `extra` to prawdopodobieństwo otwarcia dodatkowego przejścia w każdym polu,
+    co tworzy pętle; przy 0 labirynt jest drzewem.
+    """
+    rng = random.Random(seed)
+    links = [[set() for _ in range(cols)] for _ in range(rows)]
+    seen = [[False] * cols for _ in range(rows)]
+    directions = list(cw1.DIRECTIONS.items())
+
+    stack = [(0, 0)]
+    seen[0][0] = True
+    while stack:
+        x, y = stack[-1]
+        options = [(d, x + dx, y + dy) for d, (dx, dy) in directions
+                   if 0 <= x + dx < rows and 0 <= y + dy < cols and not seen[x + dx][y + dy]]
+        if not options:
+            stack.pop()
+            continue
+        d, nx, ny = rng.choice(options)
+        links[x][y].add(d)
+        links[nx][ny].add(OPPOSITE[d])
+        seen[nx][ny] = True
+        stack.append((nx, ny))
+
+    if extra:
+        for x in range(rows):
+            for y in range(cols):
+                if rng.random() < extra:
+                    d, (dx, dy) = rng.choice(directions)
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < rows and 0 <= ny < cols:
+                        links[x][y].add(d)
+                        links[nx][ny].add(OPPOSITE[d])
+
+    return [[CHAR_FOR_CONNECTIONS[frozenset(cell)] for cell in row] for row in links]
+
+
+def write_maze(lab, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in lab:
+            f.write(''.join(row) + '\n')
+
+
+def solve_path_copy(lab, start, end, algorithm='BFS'):
+    """Poprzednia wersja cw1.search: każdy wpis kolejki niesie własną kopię ścieżki."""
+    visited = set()
+    queue = deque([(start, [start])])
+    steps = 0
+    dfs = algorithm.upper() == 'DFS'
+
+    while queue:
+        if dfs:
+            pos, path = queue.pop()
+        else:
+            pos, path = queue.popleft()
+
+        steps += 1
+        if pos == end:
+            return path, steps, len(visited)
+
+        if pos in visited:
+            continue
+
+        visited.add(pos)
+        x, y = pos
+        for d, (dx, dy) in cw1.DIRECTIONS.items():
+            nx, ny = x + dx, y + dy
+            if cw1.valid_move(lab, x, y, nx, ny, dx, dy) and (nx, ny) not in visited:
+                queue.append(((nx, ny), path + [(nx, ny)]))
+
+    return None, steps, len(visited)
+
+
+def measure(solver, *args):
+    """Zwraca (wynik, czas w sekundach, szczyt pamięci w MiB)."""
+    start = time.perf_counter()
+    result = solver(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    solver(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pomiar czasu i pamięci wyszukiwania w cw1.")
+    parser.add_argument('--size', type=int, default=2000, help="bok labiryntu (domyślnie 2000)")
+    parser.add_argument('--extra', type=float, default=0.0, help="udział dodatkowych przejść (pętli)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--algorithm', type=str.upper, nargs='+', choices=cw1.ALGORITHMS, default=['BFS'])
+    parser.add_argument('--skip-old', action='store_true', help="pomiń pomiar poprzedniej wersji")
+    parser.add_argument('--old-max-size', type=int, default=OLD_SOLVER_MAX_SIZE,
+                        help=f"mierz poprzednią wersję tylko do tego boku labiryntu (domyślnie {OLD_SOLVER_MAX_SIZE})")
+    parser.add_argument('--save', metavar='PLIK', help="zapisz wygenerowany labirynt do pliku")
+    args = parser.parse_args()
+
+    print(f"Generowanie labiryntu {args.size}x{args.size}...")
+    lab = cw1.Maze(generate_maze(args.size, args.size, args.extra, args.seed))
+    if args.save:
+        write_maze(lab, args.save)
+    start, end = (0, 0), (args.size - 1, args.size - 1)
+
+    run_old = not args.skip_old and args.size <= args.old_max_size
+    if not args.skip_old and not run_old:
+        print(f"Pomijam poprzednią wersję (kopie ścieżek): bok {args.size} > {args.old_max_size}, "
+              f"pomiar nie skończyłby się w rozsądnym czasie (zmień --old-max-size).")
+
+    for algorithm in args.algorithm:
+        solvers = [("wskaźniki na rodzica", cw1.solve)]
+        if run_old and algorithm in ('BFS', 'DFS'):
+            solvers.insert(0, ("kopie ścieżek", solve_path_copy))
+
+        for name, solver in solvers:
+            (path, steps, visited), elapsed, peak = measure(solver, lab, start, end, algorithm)
+            length = len(path) if path else 0
+            print(f"{algorithm:>5} {name:>22}: {elapsed:8.2f} s, szczyt {peak:9.1f} MiB, "
+                  f"kroki={steps} odwiedzone={visited} dlugosc={length}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,222 @@
 import sys
-import math
-import heapq
-from typing import Dict, List, Optional, Tuple, Set, Generator, Any
+import time
+import multiprocessing
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QComboBox, QRadioButton, QGroupBox, QLabel,
-    QGraphicsView, QGraphicsScene, QGraphicsEllipseItem, QGraphicsLineItem,
-    QGraphicsTextItem, QFileDialog, QMessageBox, QStatusBar, QGraphicsItem
+    QPushButton, QComboBox, QRadioButton, QCheckBox, QGroupBox, QLabel, QSlider,
+    QGraphicsView, QGraphicsScene, QGraphicsPathItem, QGraphicsItem,
+    QStyleOptionGraphicsItem, QFileDialog, QMessageBox, QStatusBar
 )
-from PyQt5.QtGui import QColor, QPen, QBrush, QFont, QPainter
-from PyQt5.QtCore import Qt, QRectF
-
-class Node:
-    def __init__(self, node_id: int, x: int, y: int):
-        self.id: int = node_id
-        self.x: int = x
-        self.y: int = y
-        self.neighbors: List['Node'] = []
-        self.g: float = float('inf')
-        self.h: float = 0.0
-        self.f: float = float('inf')
-        self.parent: Optional['Node'] = None
-    
-    def __lt__(self, other: 'Node') -> bool:
-        return self.f < other.f
-    
-    def reset(self):
-        self.g = float('inf')
-        self.h = 0.0
-        self.f = float('inf')
-        self.parent = None
+from PyQt5.QtGui import QColor, QPen, QBrush, QFont, QImage, QPainter, QPainterPath, QPolygonF, QTransform
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer
+
+from cw2_search import CSRGraph, ContractionHierarchy, Graph, Landmarks, Node, search_steps
+
+
+def _build_in_background(conn, build: Callable[[CSRGraph, str], Any], csr: CSRGraph, graph_path: str):
+    """Liczy (albo wczytuje z pliku podręcznego) `build(csr, graph_path)` w osobnym procesie,
+    żeby nie blokować okna; wynik lub wyjątek wraca przez potok."""
+    try:
+        conn.send(build(csr, graph_path))
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+class NodeLayer(QGraphicsItem):
+    """Wszystkie węzły grafu jako jeden element sceny, rysowany zależnie od przybliżenia.
+
+    Przy małym przybliżeniu węzły są chmurą punktów (jedno drawPoints na kolor),
+    przy większym - kółkami, ale tylko te w odsłoniętym obszarze (siatka kubełków),
+    a etykiety pojawiają się dopiero powyżej progu. Kolory węzłów innych niż
+    domyślny trzyma słownik indeks -> kolor, więc zmiana koloru nie tworzy elementów sceny.
+    """
+
+    POINTS_BELOW_PX = 2.0   # promień węzła w pikselach, poniżej którego rysowane są punkty
+    LABELS_ABOVE_PX = 8.0   # promień węzła w pikselach, od którego rysowane są etykiety
+    GRID_CELLS = 128
+
+    def __init__(self, csr: CSRGraph, radius: float, pen: QPen, default_color: QColor):
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.csr = csr
+        self.radius = radius
+        self.pen = pen
+        self.default_color = default_color
+        self.colors: Dict[int, QColor] = {}
+        self.font = QFont("Arial", 10)
+        self._overlay: Optional[List[Tuple[QColor, QPolygonF]]] = None
+        self._lod = 1.0
+
+        xs, ys = csr.xs, csr.ys
+        self._point_list = [QPointF(x, y) for x, y in zip(xs, ys)]
+        self._points = QPolygonF(self._point_list)
+        self._rect = self._points.boundingRect().adjusted(-radius, -radius, radius, radius)
+        self._cell = max(self._rect.width(), self._rect.height()) / self.GRID_CELLS
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        left, top = self._rect.left(), self._rect.top()
+        for i, (x, y) in enumerate(zip(xs, ys)):
+            self._grid.setdefault((int((x - left) // self._cell), int((y - top) // self._cell)), []).append(i)
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def set_color(self, index: int, color: QColor):
+        self.set_colors({index: color})
+
+    def set_colors(self, colors: Dict[int, QColor]):
+        """Zmienia kolory wielu węzłów naraz i zgłasza jedno odświeżenie ich obszaru."""
+        if not colors: return
+        for index, color in colors.items():
+            if color == self.default_color:
+                self.colors.pop(index, None)
+            else:
+                self.colors[index] = color
+        self._overlay = None
+        # Punkty mają stały rozmiar w pikselach, więc margines zależy od ostatniego przybliżenia
+        pad = max(self.radius, 4.0 / self._lod)
+        xs, ys = self.csr.xs, self.csr.ys
+        left = min(xs[i] for i in colors) - pad
+        top = min(ys[i] for i in colors) - pad
+        self.update(QRectF(left, top, max(xs[i] for i in colors) + pad - left, max(ys[i] for i in colors) + pad - top))
+
+    def clear_colors(self):
+        self.colors.clear()
+        self._overlay = None
+        self.update()
+
+    def _overlay_points(self) -> List[Tuple[QColor, QPolygonF]]:
+        if self._overlay is None:
+            groups: Dict[int, Tuple[QColor, List[QPointF]]] = {}
+            points = self._point_list
+            for i, color in self.colors.items():
+                groups.setdefault(color.rgba(), (color, []))[1].append(points[i])
+            self._overlay = [(color, QPolygonF(group)) for color, group in groups.values()]
+        return self._overlay
+
+    def _visible(self, rect: QRectF) -> List[int]:
+        left, top, cell = self._rect.left(), self._rect.top(), self._cell
+        x0, x1 = int((rect.left() - left) // cell) - 1, int((rect.right() - left) // cell) + 1
+        y0, y1 = int((rect.top() - top) // cell) - 1, int((rect.bottom() - top) // cell) + 1
+        visible = []
+        for cx in range(max(x0, 0), min(x1, self.GRID_CELLS) + 1):
+            for cy in range(max(y0, 0), min(y1, self.GRID_CELLS) + 1):
+                visible.extend(self._grid.get((cx, cy), ()))
+        return visible
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
+        self._lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        radius_px = self.radius * self._lod
+
+        if radius_px < self.POINTS_BELOW_PX:
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            pen = QPen(self.default_color, max(2.0, 2 * radius_px))
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawPoints(self._points)
+            pen.setWidthF(pen.widthF() + 1)
+            for color, points in self._overlay_points():
+                pen.setColor(color)
+                painter.setPen(pen)
+                painter.drawPoints(points)
+            return
+
+        # exposedRect przy QGraphicsView.render obejmuje cały element, więc zawężamy go do urządzenia
+        device_rect = painter.worldTransform().inverted()[0].mapRect(QRectF(painter.viewport()))
+        visible = self._visible(option.exposedRect.intersected(device_rect))
+        xs, ys, r = self.csr.xs, self.csr.ys, self.radius
+        painter.setPen(self.pen)
+        by_color: Dict[int, Tuple[QColor, List[int]]] = {}
+        for i in visible:
+            color = self.colors.get(i, self.default_color)
+            by_color.setdefault(color.rgba(), (color, []))[1].append(i)
+        for color, indices in by_color.values():
+            painter.setBrush(QBrush(color))
+            for i in indices:
+                painter.drawEllipse(QPointF(xs[i], ys[i]), r, r)
+
+        if radius_px >= self.LABELS_ABOVE_PX:
+            # Etykiety w układzie ekranu: stały rozmiar i czytelne mimo odbitej osi y widoku
+            transform = painter.worldTransform()
+            painter.setWorldTransform(QTransform())
+            painter.setFont(self.font)
+            painter.setPen(Qt.black)
+            ids = self.csr.ids
+            for i in visible:
+                center = transform.map(QPointF(xs[i], ys[i]))
+                painter.drawText(QRectF(center.x() - 50, center.y() - radius_px - 20, 100, 20),
+                                 Qt.AlignHCenter | Qt.AlignBottom, str(ids[i]))
+
+
+class EdgeLayer(QGraphicsPathItem):
+    """Wszystkie krawędzie grafu jako jedna ścieżka.
+
+    Gdy krawędzi jest dużo, a cały graf mieści się w OVERVIEW_SIZE pikseli, zamiast
+    ścieżki rysowany jest jej podgląd wyrenderowany raz do obrazu, bo przy takim
+    oddaleniu pojedyncze krawędzie i tak się zlewają, a obraz rysuje się w stałym czasie.
+    """
+
+    OVERVIEW_SIZE = 1024
+    OVERVIEW_MIN_EDGES = 20000
+
+    def __init__(self, path: QPainterPath, pen: QPen):
+        super().__init__(path)
+        self.setPen(pen)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self._overview: Optional[QImage] = None
+        # Domyślne boundingRect/shape obrysowują całą ścieżkę, co przy setkach tysięcy
+        # odcinków trwa sekundy (shape przy każdym kliknięciu w scenę)
+        self._rect = path.controlPointRect().adjusted(-1, -1, 1, 1)
+        self._shape = QPainterPath()
+        self._shape.addRect(self._rect)
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def shape(self) -> QPainterPath:
+        return self._shape
+
+    def _overview_image(self) -> QImage:
+        if self._overview is None:
+            rect = self.boundingRect()
+            scale = self.OVERVIEW_SIZE / max(rect.width(), rect.height(), 1e-9)
+            image = QImage(max(1, round(rect.width() * scale)), max(1, round(rect.height() * scale)),
+                           QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.transparent)
+            # Bez antyaliasingu: dla setek tysięcy odcinków jest o rzędy wielkości szybciej,
+            # a podgląd i tak jest pomniejszany z wygładzaniem
+            painter = QPainter(image)
+            # Skala musi być jednakowa w obu osiach - przy niejednakowej Qt obrysowuje
+            # ścieżkę wielokrotnie wolniejszą metodą
+            painter.scale(scale, scale)
+            painter.translate(-rect.left(), -rect.top())
+            painter.setPen(self.pen())
+            painter.drawPath(self.path())
+            painter.end()
+            self._overview = image
+        return self._overview
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
+        rect = self.boundingRect()
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if self.path().elementCount() >= 2 * self.OVERVIEW_MIN_EDGES and max(rect.width(), rect.height()) * lod <= self.OVERVIEW_SIZE:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(rect, self._overview_image())
+            return
+        painter.setPen(self.pen())
+        painter.drawPath(self.path())
+
+
+class GraphView(QGraphicsView):
+    ZOOM_STEP = 1.25
+
+    def wheelEvent(self, event):
+        factor = self.ZOOM_STEP ** (event.angleDelta().y() / 120)
+        self.scale(factor, factor)
 
-class Graph:
-    def __init__(self):
-        self.nodes: Dict[int, Node] = {}
-    
-    def load_from_file(self, filepath: str) -> bool:
-        try:
-            with open(filepath, 'r') as f:
-                lines = f.readlines()
-            
-            self.nodes.clear()
-            n = int(lines[0].strip())
-            
-            if n == 0:
-                return True
-
-            for i in range(1, n + 1):
-                x, y = map(int, lines[i].strip().split())
-                self.nodes[i] = Node(i, x, y)
-                
-            neighbor_data = {}
-            for i in range(n + 1, 2 * n + 1):
-                parts = list(map(int, lines[i].strip().split()))
-                node_id = i - n
-                neighbor_data[node_id] = parts[1:]
-            
-            for node_id, neighbor_ids in neighbor_data.items():
-                node = self.nodes[node_id]
-                for neighbor_id in neighbor_ids:
-                    if neighbor_id in self.nodes:
-                        node.neighbors.append(self.nodes[neighbor_id])
-                    else:
-                        print(f"Ostrzeżenie: Węzeł {node_id} ma nieistniejącego sąsiada {neighbor_id}")
-            return True
-        except Exception as e:
-            QMessageBox.critical(None, "Błąd wczytywania pliku", f"Nie można wczytać grafu:\n{e}")
-            self.nodes.clear()
-            return False
 
 class MainWindow(QMainWindow):
     
@@ -87,14 +235,37 @@ class MainWindow(QMainWindow):
     PEN_WIDTH_PATH = 4.0
     
     NODE_RADIUS_SCENE = 0.3
-    FONT_SCALE_SCENE = 0.03
     CANVAS_PADDING = 5
 
+    PLAY_INTERVAL_MS = 16     # odstęp między klatkami odtwarzania
+    PLAY_FRAME_BUDGET = 0.010 # czas (s) na kroki wyszukiwania w jednej klatce
+    SPEED_MAX = 20            # ostatnia pozycja suwaka szybkości: bez limitu kroków
+    BUILD_POLL_MS = 100       # co ile sprawdzać, czy proces liczący punkty/hierarchię skończył
+
     def __init__(self):
         super().__init__()
         self.graph = Graph()
         self.search_generator: Optional[Generator[Dict[str, Any], None, None]] = None
-        self.scene_items: Dict[int | Tuple[int, int], Dict[str, QGraphicsItem]] = {}
+        self.current_node_id: Optional[int] = None
+        self.graph_path: Optional[str] = None
+        self.landmarks: Optional[Landmarks] = None
+        self.hierarchy: Optional[ContractionHierarchy] = None
+        self.node_layer: Optional[NodeLayer] = None
+        self.edge_item: Optional[EdgeLayer] = None
+        self.path_item: Optional[QGraphicsPathItem] = None
+
+        self.play_timer = QTimer(self)
+        self.play_timer.setInterval(self.PLAY_INTERVAL_MS)
+        self.play_timer.timeout.connect(self._play_tick)
+        self.play_credit = 0.0
+        self.play_last_tick = 0.0
+        self.play_to_end = False
+
+        # (proces, koniec potoku, atrybut na wynik, opis) obliczeń w tle: landmarks lub hierarchy
+        self.build_job: Optional[Tuple[Any, Any, str, str]] = None
+        self.build_timer = QTimer(self)
+        self.build_timer.setInterval(self.BUILD_POLL_MS)
+        self.build_timer.timeout.connect(self._poll_build)
 
         self.pen_edge = QPen(self.COLOR_EDGE, self.PEN_WIDTH_EDGE)
         self.pen_edge.setCosmetic(True)
@@ -142,9 +313,13 @@ class MainWindow(QMainWindow):
         algo_layout = QVBoxLayout()
         self.algo_a_star = QRadioButton("A* (f=g+h)")
         self.algo_gbfs = QRadioButton("Zachłanny BFS (f=h)")
+        self.algo_ch = QRadioButton("Hierarchie skrótów (CH)")
         self.algo_a_star.setChecked(True)
         algo_layout.addWidget(self.algo_a_star)
         algo_layout.addWidget(self.algo_gbfs)
+        algo_layout.addWidget(self.algo_ch)
+        self.chk_landmarks = QCheckBox("Heurystyka ALT (punkty orientacyjne)")
+        algo_layout.addWidget(self.chk_landmarks)
         algo_box.setLayout(algo_layout)
         control_layout.addWidget(algo_box)
 
@@ -156,6 +331,20 @@ class MainWindow(QMainWindow):
         self.btn_next_step = QPushButton("Następny krok")
         self.btn_next_step.clicked.connect(self.next_step)
         run_layout.addWidget(self.btn_next_step)
+        self.btn_play = QPushButton("Odtwórz")
+        self.btn_play.clicked.connect(self.toggle_play)
+        run_layout.addWidget(self.btn_play)
+        self.btn_finish = QPushButton("Do końca")
+        self.btn_finish.clicked.connect(self.run_to_completion)
+        run_layout.addWidget(self.btn_finish)
+        self.sld_speed = QSlider(Qt.Horizontal)
+        self.sld_speed.setRange(0, self.SPEED_MAX)
+        self.sld_speed.setValue(self.SPEED_MAX // 2)
+        self.sld_speed.valueChanged.connect(self._update_speed_label)
+        run_layout.addWidget(self.sld_speed)
+        self.lbl_speed = QLabel()
+        run_layout.addWidget(self.lbl_speed)
+        self._update_speed_label()
         self.btn_reset = QPushButton("Reset")
         self.btn_reset.clicked.connect(self.reset_visualization)
         run_layout.addWidget(self.btn_reset)
@@ -165,7 +354,7 @@ class MainWindow(QMainWindow):
 
         self.scene = QGraphicsScene()
         self.scene.setBackgroundBrush(QBrush(Qt.white))
-        self.view = QGraphicsView(self.scene)
+        self.view = GraphView(self.scene)
         self.view.setRenderHint(QPainter.Antialiasing)
         self.view.setDragMode(QGraphicsView.ScrollHandDrag)
         self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -189,76 +378,59 @@ class MainWindow(QMainWindow):
 
         self.reset_visualization(full_reset=True)
 
-        if self.graph.load_from_file(filepath):
-            self.lbl_filename.setText(filepath.split('/')[-1])
-            self.draw_graph()
-            
-            node_ids = sorted(self.graph.nodes.keys())
-            str_node_ids = [str(nid) for nid in node_ids]
-            self.cmb_start_node.addItems(str_node_ids)
-            self.cmb_goal_node.addItems(str_node_ids)
-            
-            if node_ids:
-                self.cmb_start_node.setCurrentIndex(0)
-                self.cmb_goal_node.setCurrentIndex(len(node_ids) - 1)
-                self._set_controls_state(True)
-                self.lbl_status.setText("Graf wczytany.")
-
-                self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
-                self.view.scale(1, -1)
-                self.lbl_status.setText("Wczytano pusty graf. Wczytaj inny plik.")
+        try:
+            self.graph.load_from_file(filepath)
+        except Exception as e:
+            QMessageBox.critical(None, "Błąd wczytywania pliku", f"Nie można wczytać grafu:\n{e}")
+            return
+
+        self.graph_path = filepath
+        self.landmarks = None
+        self.hierarchy = None
+        self.lbl_filename.setText(filepath.split('/')[-1])
+        self.draw_graph()
+        
+        node_ids = sorted(self.graph.nodes.keys())
+        str_node_ids = [str(nid) for nid in node_ids]
+        self.cmb_start_node.addItems(str_node_ids)
+        self.cmb_goal_node.addItems(str_node_ids)
+        
+        if node_ids:
+            self.cmb_start_node.setCurrentIndex(0)
+            self.cmb_goal_node.setCurrentIndex(len(node_ids) - 1)
+            self._set_controls_state(True)
+            self.lbl_status.setText("Graf wczytany.")
+
+            self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+            self.view.scale(1, -1)
+            self.lbl_status.setText("Wczytano pusty graf. Wczytaj inny plik.")
 
     def draw_graph(self):
+        """Rysuje krawędzie jako jedną ścieżkę, a węzły jako jeden NodeLayer."""
         self.scene.clear()
-        self.scene_items.clear()
+        self.node_layer = self.edge_item = self.path_item = None
         if not self.graph.nodes: return
 
-        nodes = self.graph.nodes.values()
-        min_x = min(n.x for n in nodes)
-        max_x = max(n.x for n in nodes)
-        min_y = min(n.y for n in nodes)
-        max_y = max(n.y for n in nodes)
-        
-        graph_width = max(max_x - min_x, 1)
-        graph_height = max(max_y - min_y, 1)
-
-        scene_rect = QRectF(
-            min_x - self.CANVAS_PADDING, min_y - self.CANVAS_PADDING, 
-            graph_width + 2 * self.CANVAS_PADDING, 
-            graph_height + 2 * self.CANVAS_PADDING
-        )
-        self.scene.setSceneRect(scene_rect)
-        
-        drawn_edges = set()
-        for node in self.graph.nodes.values():
-            for neighbor in node.neighbors:
-                edge_key = tuple(sorted((node.id, neighbor.id)))
-                if edge_key not in drawn_edges:
-                    line = self.scene.addLine(node.x, node.y, neighbor.x, neighbor.y, self.pen_edge)
-                    line.setZValue(-1)
-                    self.scene_items[edge_key] = {'line': line}
-                    drawn_edges.add(edge_key)
-
-        r = self.NODE_RADIUS_SCENE
-        
-        for node_id, node in self.graph.nodes.items():
-            oval = self.scene.addEllipse(node.x - r, node.y - r, r * 2, r * 2, 
-                                          self.pen_node, QBrush(self.COLOR_DEFAULT))
-            
-            text = QGraphicsTextItem(str(node_id))
-            text.setFont(QFont("Arial", 10))
-            
-            scale = self.FONT_SCALE_SCENE
-            text.setTransform(text.transform().scale(scale, -scale))
-            
-            text_rect = text.boundingRect()
-            text.setPos(
-                node.x - (text_rect.width() * scale) / 2,
-                node.y + (text_rect.height() * scale) / 2
-            )
-            
-            self.scene.addItem(text)
-            self.scene_items[node_id] = {'oval': oval, 'text': text}
+        csr = self.graph.to_csr()
+        self.node_layer = NodeLayer(csr, self.NODE_RADIUS_SCENE, self.pen_node, self.COLOR_DEFAULT)
+        nodes_rect = self.node_layer.boundingRect()
+        self.scene.setSceneRect(nodes_rect.adjusted(-self.CANVAS_PADDING, -self.CANVAS_PADDING,
+                                                    self.CANVAS_PADDING, self.CANVAS_PADDING))
+
+        edges = QPainterPath()
+        xs, ys, offsets, targets = csr.xs, csr.ys, csr.offsets, csr.targets
+        for i in range(len(csr)):
+            for t in targets[offsets[i]:offsets[i + 1]]:
+                # Krawędź nieskierowana jest zapisana dwa razy - rysujemy ją raz
+                if t > i or i not in targets[offsets[t]:offsets[t + 1]]:
+                    edges.moveTo(xs[i], ys[i])
+                    edges.lineTo(xs[t], ys[t])
+        self.edge_item = EdgeLayer(edges, self.pen_edge)
+        self.edge_item.setZValue(-1)
+        self.scene.addItem(self.edge_item)
+
+        self.node_layer.setZValue(1)
+        self.scene.addItem(self.node_layer)
 
     def start_search(self):
         start_text = self.cmb_start_node.currentText()
@@ -276,19 +448,79 @@ class MainWindow(QMainWindow):
             return
 
         self.reset_visualization(full_reset=False)
-        algo_type = "A*" if self.algo_a_star.isChecked() else "GBFS"
+        algo_type = "A*" if self.algo_a_star.isChecked() else "GBFS" if self.algo_gbfs.isChecked() else "CH"
         
         self._color_node(start_id, self.COLOR_START)
         self._color_node(goal_id, self.COLOR_GOAL)
         
         self._set_controls_state(False)
+        if self.chk_landmarks.isChecked() and self.landmarks is None:
+            self._start_build('landmarks', Landmarks.load_or_compute, "punktów orientacyjnych")
+            return
+        if algo_type == "CH" and self.hierarchy is None:
+            self._start_build('hierarchy', ContractionHierarchy.load_or_compute, "hierarchii skrótów")
+            return
+
         self.btn_next_step.setEnabled(True)
-        
+        self.btn_play.setEnabled(True)
+        self.btn_finish.setEnabled(True)
+
         self.search_generator = self.search_algorithm(self.graph.nodes[start_id], self.graph.nodes[goal_id], algo_type)
-        self.lbl_status.setText(f"Rozpoczynanie {algo_type}. Kliknij 'Następny krok'.")
+        self.lbl_status.setText(f"Rozpoczynanie {algo_type}. Kliknij 'Następny krok' lub 'Odtwórz'.")
         self.lbl_cost.setText("Koszt ścieżki: N/A")
         self.next_step()
 
+    def _start_build(self, attribute: str, build: Callable[[CSRGraph, str], Any], description: str):
+        """Uruchamia `build` w osobnym procesie; wynik trafia do `self.<attribute>`,
+        a potem wyszukiwanie startuje samo."""
+        context = multiprocessing.get_context('spawn')
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_build_in_background,
+                                  args=(sender, build, self.graph.to_csr(), self.graph_path), daemon=True)
+        process.start()
+        sender.close()
+        self.build_job = (process, receiver, attribute, description)
+        self.build_timer.start()
+        self.btn_reset.setEnabled(True)
+        self.lbl_status.setText(f"Obliczanie {description} w tle (duży graf: nawet kilka minut). "
+                                "'Reset' przerywa.")
+
+    def _poll_build(self):
+        process, receiver, attribute, description = self.build_job
+        if receiver.poll():
+            try:
+                result = receiver.recv()
+            except EOFError:
+                result = RuntimeError("Proces obliczeń zakończył się bez wyniku.")
+        elif not process.is_alive():
+            result = RuntimeError(f"Proces obliczeń zakończył się z kodem {process.exitcode}.")
+        else:
+            return
+
+        self._cancel_build()
+        if isinstance(result, Exception):
+            QMessageBox.critical(self, "Błąd", f"Nie można obliczyć {description}:\n{result}")
+            self._set_controls_state(True)
+            self.lbl_status.setText("Gotowy do nowego wyszukiwania.")
+            return
+        setattr(self, attribute, result)
+        self.start_search()
+
+    def _cancel_build(self):
+        if self.build_job is None:
+            return
+        self.build_timer.stop()
+        process, receiver, _, _ = self.build_job
+        self.build_job = None
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+
+    def closeEvent(self, event):
+        self._cancel_build()
+        super().closeEvent(event)
+
     def next_step(self):
         if not self.search_generator: return
         try:
@@ -298,36 +530,133 @@ class MainWindow(QMainWindow):
             self._end_search()
 
     def update_visualization(self, state: Dict[str, Any]):
+        self._apply_steps([state])
+
+    def _apply_steps(self, states: List[Dict[str, Any]]):
+        """Nanosi zmiany z kolejnych kroków wyszukiwania jednym przemalowaniem.
+
+        Dla każdego węzła liczy się tylko jego ostatni kolor, więc kroki z jednej
+        klatki odtwarzania dają jedno odświeżenie sceny zamiast jednego na krok.
+        """
         start_id = int(self.cmb_start_node.currentText())
         goal_id = int(self.cmb_goal_node.currentText())
-
-        for node in state.get('open', []):
-            if node.id not in [start_id, goal_id]: self._color_node(node.id, self.COLOR_OPEN)
-        for node in state.get('closed', []):
-            if node.id not in [start_id, goal_id]: self._color_node(node.id, self.COLOR_CLOSED)
-                
-        current = state.get('current')
-        if current and current.id not in [start_id, goal_id]:
-            self._color_node(current.id, self.COLOR_CURRENT)
-            self.lbl_status.setText(f"Przetwarzanie węzła {current.id}...")
-
-        if state.get('path_found', False):
-            path = state.get('path', [])
-            cost = state.get('cost', 0.0)
+        colors: Dict[int, QColor] = {}
+        final: Optional[Dict[str, Any]] = None
+
+        for state in states:
+            if self.current_node_id is not None:
+                colors[self.current_node_id] = self.COLOR_CLOSED
+            self.current_node_id = None
+
+            for node in state.get('opened', []):
+                colors[node.id] = self.COLOR_OPEN
+            for node in state.get('closed', []):
+                colors[node.id] = self.COLOR_CLOSED
+
+            current = state.get('current')
+            if current:
+                self.current_node_id = current.id
+                colors[current.id] = self.COLOR_CURRENT
+
+            if state.get('path_found', False) or state.get('no_path', False):
+                final = state
+                break
+
+        colors.pop(start_id, None)
+        colors.pop(goal_id, None)
+        if self.node_layer is not None:
+            index_of = self.graph.to_csr().index_of
+            self.node_layer.set_colors({index_of(node_id): color for node_id, color in colors.items()})
+        if self.current_node_id is not None and self.current_node_id not in [start_id, goal_id]:
+            self.lbl_status.setText(f"Przetwarzanie węzła {self.current_node_id}...")
+
+        if final is None:
+            return
+        if final.get('path_found', False):
+            path = final.get('path', [])
+            cost = final.get('cost', 0.0)
             self.lbl_status.setText(f"Znaleziono ścieżkę! Długość: {len(path)} węzłów.")
             self.lbl_cost.setText(f"Koszt ścieżki: {cost:.4f}")
             self._draw_path(path)
-            self._end_search()
-        elif state.get('no_path', False):
+        else:
             self.lbl_status.setText("Nie znaleziono ścieżki.")
-            self._end_search()
-            
+        self._end_search()
+
+    def toggle_play(self):
+        if self.play_timer.isActive():
+            self._stop_playing()
+        else:
+            self._start_playing()
+
+    def run_to_completion(self):
+        """Odtwarza wyszukiwanie do końca bez limitu kroków (nadal w klatkach, więc GUI reaguje)."""
+        self.play_to_end = True
+        self._start_playing()
+
+    def _start_playing(self):
+        if not self.search_generator: return
+        self.play_credit = 0.0
+        self.play_last_tick = time.perf_counter()
+        self.play_timer.start()
+        self.btn_play.setText("Pauza")
+        self.btn_next_step.setEnabled(False)
+
+    def _stop_playing(self):
+        self.play_timer.stop()
+        self.play_to_end = False
+        self.btn_play.setText("Odtwórz")
+        self.btn_next_step.setEnabled(self.search_generator is not None)
+
+    def _steps_per_second(self) -> Optional[float]:
+        """Szybkość z suwaka: od 1 do ok. 700 kroków/s w skali logarytmicznej, None - bez limitu."""
+        value = self.sld_speed.value()
+        return None if value >= self.SPEED_MAX else 2 ** (value / 2)
+
+    def _update_speed_label(self):
+        speed = self._steps_per_second()
+        self.lbl_speed.setText("maks." if speed is None else f"{speed:.0f} kroków/s")
+
+    def _play_tick(self):
+        """Jedna klatka odtwarzania: tyle kroków, ile pozwala szybkość i budżet czasu klatki."""
+        now = time.perf_counter()
+        speed = None if self.play_to_end else self._steps_per_second()
+        if speed is not None:
+            # Zaległe kroki nie kumulują się ponad jedną klatkę (np. po zatrzymaniu okna)
+            elapsed = min(now - self.play_last_tick, 2 * self.PLAY_INTERVAL_MS / 1000)
+            self.play_credit += elapsed * speed
+        self.play_last_tick = now
+
+        deadline = now + self.PLAY_FRAME_BUDGET
+        states = []
+        while self.search_generator is not None and (speed is None or len(states) < int(self.play_credit)):
+            try:
+                state = next(self.search_generator)
+            except StopIteration:
+                self._end_search()
+                break
+            states.append(state)
+            if state.get('path_found', False) or state.get('no_path', False):
+                break
+            if time.perf_counter() >= deadline:
+                break
+
+        if speed is not None:
+            self.play_credit -= len(states)
+        if states:
+            self._apply_steps(states)
+
     def reset_visualization(self, full_reset: bool = True):
+        self._stop_playing()
+        self._cancel_build()
         self.search_generator = None
+        self.current_node_id = None
         if full_reset:
             self.scene.clear()
-            self.scene_items.clear()
+            self.node_layer = self.edge_item = self.path_item = None
             self.graph = Graph()
+            self.graph_path = None
+            self.landmarks = None
+            self.hierarchy = None
             self.cmb_start_node.clear()
             self.cmb_goal_node.clear()
             self._set_controls_state(False)
@@ -336,12 +665,13 @@ class MainWindow(QMainWindow):
             self.lbl_status.setText("Wczytaj graf.")
             self.view.resetTransform()
         else:
-            for item_key, item_dict in self.scene_items.items():
-                if isinstance(item_key, int): 
-                    self._color_node(item_key, self.COLOR_DEFAULT)
-                elif isinstance(item_key, tuple) and 'line' in item_dict:
-                    item_dict['line'].setPen(self.pen_edge)
-            
+            if self.node_layer is not None:
+                self.node_layer.clear_colors()
+            if self.path_item is not None:
+                self.scene.removeItem(self.path_item)
+                self.path_item = None
+
+
             start_text = self.cmb_start_node.currentText()
             goal_text = self.cmb_goal_node.currentText()
             if start_text: self._color_node(int(start_text), self.COLOR_START)
@@ -358,94 +688,40 @@ class MainWindow(QMainWindow):
         self.cmb_goal_node.setEnabled(enabled)
         self.algo_a_star.setEnabled(enabled)
         self.algo_gbfs.setEnabled(enabled)
+        self.algo_ch.setEnabled(enabled)
+        self.chk_landmarks.setEnabled(enabled)
         self.btn_start.setEnabled(enabled)
         self.btn_reset.setEnabled(enabled)
         self.btn_next_step.setEnabled(False)
-        
+        self.btn_play.setEnabled(False)
+        self.btn_finish.setEnabled(False)
+
     def _end_search(self):
         self.search_generator = None
+        self._stop_playing()
         self._set_controls_state(True)
         self.btn_next_step.setEnabled(False)
 
     def _color_node(self, node_id: int, color: QColor):
-        if node_id in self.scene_items:
-            self.scene_items[node_id]['oval'].setBrush(QBrush(color))
+        if self.node_layer is not None and node_id in self.graph.nodes:
+            self.node_layer.set_color(self.graph.to_csr().index_of(node_id), color)
 
     def _draw_path(self, path: List[Node]):
         if len(path) < 2: return
-        
-        for i in range(len(path) - 1):
-            if i > 0: self._color_node(path[i].id, self.COLOR_PATH)
-            edge_key = tuple(sorted((path[i].id, path[i+1].id)))
-            if edge_key in self.scene_items:
-                self.scene_items[edge_key]['line'].setPen(self.pen_path)
-                self.scene_items[edge_key]['line'].setZValue(0)
+
+        line = QPainterPath(QPointF(path[0].x, path[0].y))
+        for node in path[1:]:
+            line.lineTo(node.x, node.y)
+        self.path_item = self.scene.addPath(line, self.pen_path)
+        self.path_item.setZValue(0)
+        for node in path[1:-1]:
+            self._color_node(node.id, self.COLOR_PATH)
         self._color_node(path[0].id, self.COLOR_START)
         self._color_node(path[-1].id, self.COLOR_GOAL)
 
-    @staticmethod
-    def _calculate_distance(node1: Node, node2: Node) -> float:
-        return math.sqrt((node1.x - node2.x)**2 + (node1.y - node2.y)**2)
-
-    @staticmethod
-    def _reconstruct_path(current: Node) -> List[Node]:
-        path = []
-        while current:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
-
     def search_algorithm(self, start_node: Node, goal_node: Node, algorithm_type: str) -> Generator[Dict[str, Any], None, None]:
-        for node in self.graph.nodes.values(): node.reset()
-
-        open_set: List[Tuple[float, int, Node]] = []
-        open_set_lookup: Set[Node] = set()
-        closed_set: Set[Node] = set()
-        
-        start_node.g = 0.0
-        start_node.h = self.calculate_distance(start_node, goal_node)
-        start_node.f = start_node.h if algorithm_type == "GBFS" else (start_node.g + start_node.h)
-        
-        heapq.heappush(open_set, (start_node.f, start_node.id, start_node))
-        open_set_lookup.add(start_node)
-        
-        yield {"open": list(open_set_lookup), "closed": set(closed_set), "current": None}
-
-        while open_set:
-            f_cost, _, current_node = heapq.heappop(open_set)
-            open_set_lookup.remove(current_node)
-            
-            if current_node in closed_set: continue
-            closed_set.add(current_node)
-
-            yield {"open": list(open_set_lookup), "closed": set(closed_set), "current": current_node}
-
-            if current_node == goal_node:
-                path = self._reconstruct_path(current_node)
-                yield {"path_found": True, "path": path, "cost": goal_node.g, "open": list(open_set_lookup), "closed": set(closed_set)}
-                return
-
-            for neighbor in current_node.neighbors:
-                if neighbor in closed_set: continue
-                
-                tentative_g_score = current_node.g + self.calculate_distance(current_node, neighbor)
-                
-                if tentative_g_score < neighbor.g:
-                    neighbor.parent = current_node
-                    neighbor.g = tentative_g_score
-                    neighbor.h = self.calculate_distance(neighbor, goal_node)
-                    neighbor.f = neighbor.h if algorithm_type == "GBFS" else (neighbor.g + neighbor.h)
-                    
-                    if neighbor not in open_set_lookup:
-                        heapq.heappush(open_set, (neighbor.f, neighbor.id, neighbor))
-                        open_set_lookup.add(neighbor)
-        
-        yield {"no_path": True}
-        return
-
-    @classmethod
-    def calculate_distance(cls, node1, node2):
-        return cls._calculate_distance(node1, node2)
+        landmarks = self.landmarks if self.chk_landmarks.isChecked() else None
+        return search_steps(self.graph, start_node, goal_node, algorithm_type, landmarks, self.hierarchy)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
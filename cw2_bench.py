@@ -0,0 +1,146 @@
+import argparse
+import heapq
+import math
+import random
+import time
+
+from cw2_search import ContractionHierarchy, Graph, Node, calculate_distance, search_stats
+
+
+def random_geometric_graph(n, radius, size=10000, seed=None):
+    """Losowy graf geometryczny: n punktów w kwadracie size x size,
+    krawędzie między punktami odległymi o co najwyżej `radius`."""
+    rng = random.Random(seed)
+    graph = Graph()
+    cells = {}
+    for node_id in range(1, n + 1):
+        node = Node(node_id, rng.randint(0, size), rng.randint(0, size))
+        graph.nodes[node_id] = node
+        cells.setdefault((node.x // radius, node.y // radius), []).append(node)
+
+    for (cx, cy), bucket in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in cells.get((cx + dx, cy + dy), ()):
+                    for node in bucket:
+                        if node.id < other.id and calculate_distance(node, other) <= radius:
+                            node.neighbors.append(other)
+                            other.neighbors.append(node)
+    return graph
+
+
+def write_graph(graph, path):
+    ids = sorted(graph.nodes)
+    with open(path, 'w') as f:
+        f.write(f"{len(ids)}\n")
+        for node_id in ids:
+            node = graph.nodes[node_id]
+            f.write(f"{node.x} {node.y}\n")
+        for node_id in ids:
+            f.write(" ".join(str(i) for i in [node_id] + [nb.id for nb in graph.nodes[node_id].neighbors]) + "\n")
+
+
+def legacy_search(graph, start, goal, mode="A*"):
+    """Poprzednia wersja wyszukiwania z cw2: stan w węzłach, bez ponownego
+    wstawiania do kopca po poprawie g (kopiec trzyma nieaktualne f)."""
+    g, f, parent = {}, {}, {}
+    start_node, goal_node = graph.nodes[start], graph.nodes[goal]
+    g[start] = 0.0
+    h = calculate_distance(start_node, goal_node)
+    f[start] = h
+    open_set = [(h, start, start_node)]
+    open_set_lookup = {start}
+    closed_set = set()
+    expansions = 0
+
+    while open_set:
+        _, current_id, current_node = heapq.heappop(open_set)
+        open_set_lookup.remove(current_id)
+        if current_id in closed_set: continue
+        closed_set.add(current_id)
+        expansions += 1
+
+        if current_id == goal:
+            path = [current_id]
+            while path[-1] in parent:
+                path.append(parent[path[-1]])
+            return path[::-1], g[goal], expansions
+
+        for neighbor in current_node.neighbors:
+            if neighbor.id in closed_set: continue
+            tentative = g[current_id] + calculate_distance(current_node, neighbor)
+            if tentative < g.get(neighbor.id, math.inf):
+                parent[neighbor.id] = current_id
+                g[neighbor.id] = tentative
+                h = calculate_distance(neighbor, goal_node)
+                f[neighbor.id] = h if mode == "GBFS" else tentative + h
+                if neighbor.id not in open_set_lookup:
+                    heapq.heappush(open_set, (f[neighbor.id], neighbor.id, neighbor))
+                    open_set_lookup.add(neighbor.id)
+
+    return None, math.inf, expansions
+
+
+def run(solver, graph, queries, mode):
+    start = time.perf_counter()
+    results = [solver(graph, s, t, mode) for s, t in queries]
+    return results, time.perf_counter() - start
+
+
+def time_hierarchy(csr, queries):
+    """Czas budowy CH oraz zapytań CH i A* na tych samych parach węzłów.
+
+    Tylko pomiar - zgodność CH z Dijkstrą sprawdza test_cw2_search.py.
+    """
+    start = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(csr)
+    print(f"budowa CH: {time.perf_counter() - start:7.2f} s, krawędzie w hierarchii: "
+          f"{len(hierarchy.up_targets) + len(hierarchy.down_targets)} (graf: {len(csr.targets)})")
+
+    reference, ref_time = run(search_stats, csr, queries, "A*")
+    start = time.perf_counter()
+    results = [search_stats(csr, s, t, "CH", hierarchy=hierarchy) for s, t in queries]
+    ch_time = time.perf_counter() - start
+
+    print(f"        A*: {ref_time / len(queries) * 1e3:9.3f} ms/zapytanie, rozwinięte węzły: {sum(r[2] for r in reference)}")
+    print(f"        CH: {ch_time / len(queries) * 1e3:9.3f} ms/zapytanie, rozwinięte węzły: {sum(r[2] for r in results)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Porównanie wyszukiwania w cw2 na losowych grafach geometrycznych.")
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--radius', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--mode', choices=("A*", "GBFS"), default="A*")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--save', metavar='PLIK', help="zapisz wygenerowany graf do pliku")
+    parser.add_argument('--check-ch', action='store_true',
+                        help="zamiast porównania z poprzednią wersją zmierz budowę i zapytania CH względem A*")
+    args = parser.parse_args()
+
+    graph = random_geometric_graph(args.nodes, args.radius, seed=args.seed)
+    edges = sum(len(node.neighbors) for node in graph.nodes.values()) // 2
+    print(f"Graf: {len(graph.nodes)} węzłów, {edges} krawędzi")
+    if args.save:
+        write_graph(graph, args.save)
+
+    rng = random.Random(args.seed)
+    ids = list(graph.nodes)
+    queries = [(rng.choice(ids), rng.choice(ids)) for _ in range(args.queries)]
+
+    csr = graph.to_csr()
+    if args.check_ch:
+        time_hierarchy(csr, queries)
+        return
+
+    old, old_time = run(legacy_search, graph, queries, args.mode)
+    new, new_time = run(search_stats, csr, queries, args.mode)
+
+    worse = sum(1 for (_, a, _), (_, b, _) in zip(old, new) if b < a - 1e-9)
+    print(f"poprzednio: {old_time:7.2f} s, rozwinięte węzły: {sum(r[2] for r in old)}")
+    print(f"     teraz: {new_time:7.2f} s, rozwinięte węzły: {sum(r[2] for r in new)}")
+    print(f"zapytania, w których poprzednia wersja zwróciła droższą ścieżkę: {worse}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
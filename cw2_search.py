@@ -0,0 +1,1018 @@
+import os
+import sys
+import csv
+import json
+import math
+import time
+import heapq
+import hashlib
+import argparse
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple, Generator, Any
+
+# Wersja formatu pliku podręcznego CSRGraph; zmiana unieważnia stare pliki
+CACHE_VERSION = 2
+CACHE_SUFFIX = '.csr.npz'
+CSR_ARRAYS = ('xs', 'ys', 'offsets', 'targets', 'lengths', 'missing')
+
+
+def _file_digest(filepath: str) -> str:
+    with open(filepath, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()
+
+
+def _cache_is_fresh(cache, filepath: str, stat: os.stat_result) -> bool:
+    """Sprawdza, czy plik podręczny (.npz) opisuje bieżącą wersję pliku grafu."""
+    if int(cache['version']) != CACHE_VERSION or int(cache['size']) != stat.st_size:
+        return False
+    if int(cache['mtime_ns']) == stat.st_mtime_ns:
+        return True
+    return _file_digest(filepath) == str(cache['digest'])
+
+
+def _load_sidecar(path: str, filepath: str, stat: os.stat_result,
+                  required: Tuple[str, ...] = ()) -> Optional[Dict[str, Any]]:
+    """Tablice z pliku podręcznego `path` obok pliku grafu `filepath`.
+
+    Zwraca None, gdy pliku nie ma, jest uszkodzony, opisuje inną wersję grafu
+    albo brakuje w nim którejś z tablic `required`. Wymaga NumPy.
+    """
+    import numpy as np
+    try:
+        with np.load(path) as cache:
+            if not _cache_is_fresh(cache, filepath, stat) or not set(required) <= set(cache.files):
+                return None
+            return {name: cache[name] for name in cache.files}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_sidecar(path: str, stat: os.stat_result, digest: str, **arrays):
+    """Zapisuje tablice do pliku podręcznego razem z opisem wersji grafu (rozmiar,
+    czas modyfikacji, skrót). Zapis idzie przez plik tymczasowy i os.replace, więc
+    przerwany zapis nie zostawia uszkodzonego pliku; błędy zapisu są pomijane."""
+    import numpy as np
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, version=CACHE_VERSION, size=stat.st_size, mtime_ns=stat.st_mtime_ns, digest=digest, **arrays)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _warn_missing_neighbors(missing: List[Tuple[int, int]]):
+    # Na stderr, bo stdout bywa wyjściem danych (CSV/JSONL w trybie wsadowym)
+    for node_id, neighbor_id in missing:
+        print(f"Ostrzeżenie: Węzeł {node_id} ma nieistniejącego sąsiada {neighbor_id}", file=sys.stderr)
+
+
+class Node:
+    def __init__(self, node_id: int, x: int, y: int):
+        self.id: int = node_id
+        self.x: int = x
+        self.y: int = y
+        self.neighbors: List['Node'] = []
+
+
+class Graph:
+    """Graf z obiektów Node.
+
+    Wyszukiwanie działa na tablicowej kopii z `to_csr`, budowanej przy pierwszym
+    użyciu i potem zapamiętanej. Po pierwszym wyszukiwaniu graf należy traktować
+    jako zamrożony: kto potem zmienia `nodes` albo `Node.neighbors`, musi wywołać
+    `invalidate_csr`, inaczej wyszukiwanie użyje nieaktualnej kopii.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[int, Node] = {}
+        self._csr: Optional['CSRGraph'] = None
+
+    def to_csr(self) -> 'CSRGraph':
+        """Tablicowa kopia grafu do wyszukiwania, budowana przy pierwszym użyciu."""
+        if self._csr is None:
+            self._csr = CSRGraph.from_graph(self)
+        return self._csr
+
+    def invalidate_csr(self):
+        """Odrzuca kopię z `to_csr` po zmianie węzłów lub krawędzi."""
+        self._csr = None
+
+    def load_from_file(self, filepath: str) -> bool:
+        """Wczytuje graf w formacie: n, n linii "x y", n linii "id sąsiad1 sąsiad2 ...".
+
+        Plik czyta CSRGraph.load_from_file (z plikiem podręcznym obok, jeśli jest
+        NumPy), a obiekty Node powstają z gotowych tablic. Przy błędzie czyści
+        graf i przekazuje wyjątek dalej.
+        """
+        try:
+            self.nodes.clear()
+            self.invalidate_csr()
+            csr = CSRGraph.load_from_file(filepath)
+
+            nodes = [Node(node_id, int(x), int(y)) for node_id, x, y in zip(csr.ids, csr.xs, csr.ys)]
+            offsets, targets = csr.offsets, csr.targets
+            for i, node in enumerate(nodes):
+                node.neighbors = [nodes[t] for t in targets[offsets[i]:offsets[i + 1]]]
+            self.nodes = {node.id: node for node in nodes}
+            self._csr = csr
+            return True
+        except Exception:
+            self.nodes.clear()
+            raise
+
+
+def calculate_distance(node1: Node, node2: Node) -> float:
+    return math.sqrt((node1.x - node2.x)**2 + (node1.y - node2.y)**2)
+
+
+class CSRGraph:
+    """Graf w formacie CSR (compressed sparse row) na płaskich tablicach.
+
+    Sąsiedzi węzła o indeksie i to targets[offsets[i]:offsets[i + 1]], a długości
+    tych krawędzi leżą pod tymi samymi pozycjami w `lengths`. Indeksy węzłów
+    to 0..n-1, a `ids` przechowuje ich identyfikatory z pliku. Graf nie trzyma
+    żadnego stanu wyszukiwania, więc wiele wyszukiwań może korzystać z niego naraz.
+    """
+
+    def __init__(self, ids: array, xs: array, ys: array, offsets: array, targets: array, lengths: Optional[array] = None):
+        self.ids = ids
+        self.xs = xs
+        self.ys = ys
+        self.offsets = offsets
+        self.targets = targets
+        if lengths is None:
+            lengths = array('d', bytes(8 * len(targets)))
+            for i in range(len(ids)):
+                x, y = xs[i], ys[i]
+                for e in range(offsets[i], offsets[i + 1]):
+                    t = targets[e]
+                    lengths[e] = math.sqrt((x - xs[t])**2 + (y - ys[t])**2)
+        self.lengths = lengths
+        self._reversed: Optional[Tuple[array, array, array]] = None
+        # Pary (id węzła, id sąsiada) z pliku, w których sąsiad nie istnieje; krawędzie pominięto
+        self.missing_neighbors: List[Tuple[int, int]] = []
+        # Słownik id -> indeks jest potrzebny tylko, gdy id nie są kolejnymi liczbami 1..n
+        self._index = None if all(node_id == i + 1 for i, node_id in enumerate(ids)) else {node_id: i for i, node_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def reversed_arrays(self) -> Tuple[array, array, array]:
+        """(offsets, targets, lengths) grafu z odwróconymi krawędziami, liczone raz."""
+        if self._reversed is None:
+            n = len(self.ids)
+            counts = array('i', bytes(4 * (n + 1)))
+            for t in self.targets:
+                counts[t + 1] += 1
+            offsets = array('i', [0]) * (n + 1)
+            for i in range(n):
+                offsets[i + 1] = offsets[i] + counts[i + 1]
+            fill = array('i', offsets)
+            targets = array('i', bytes(4 * len(self.targets)))
+            lengths = array('d', bytes(8 * len(self.targets)))
+            for i in range(n):
+                for e in range(self.offsets[i], self.offsets[i + 1]):
+                    t = self.targets[e]
+                    targets[fill[t]] = i
+                    lengths[fill[t]] = self.lengths[e]
+                    fill[t] += 1
+            self._reversed = (offsets, targets, lengths)
+        return self._reversed
+
+    @cached_property
+    def key(self) -> str:
+        """Skrót zawartości grafu; rozróżnia grafy w pamięci podręcznej wyników."""
+        digest = hashlib.blake2b(digest_size=16)
+        for values in (self.ids, self.xs, self.ys, self.offsets, self.targets, self.lengths):
+            digest.update(values)
+        return digest.hexdigest()
+
+    def index_of(self, node_id: int) -> int:
+        if self._index is not None:
+            return self._index[node_id]
+        if not 1 <= node_id <= len(self.ids):
+            raise KeyError(node_id)
+        return node_id - 1
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CSRGraph':
+        ids = array('l', sorted(graph.nodes))
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        xs, ys = array('d'), array('d')
+        offsets, targets = array('i', [0]), array('i')
+        for node_id in ids:
+            node = graph.nodes[node_id]
+            xs.append(node.x)
+            ys.append(node.y)
+            targets.extend(index[neighbor.id] for neighbor in node.neighbors)
+            offsets.append(len(targets))
+        return cls(ids, xs, ys, offsets, targets)
+
+    @classmethod
+    def load_from_file(cls, filepath: str, use_cache: bool = True) -> 'CSRGraph':
+        """Wczytuje plik w formacie Graph.load_from_file wprost do tablic, bez obiektów Node.
+
+        Z NumPy plik jest parsowany wektorowo, a wynik trafia do pliku obok
+        (`<plik>.csr.npz`) i jest z niego brany przy kolejnych wczytaniach, dopóki
+        zgadzają się wersja formatu, rozmiar i czas modyfikacji lub skrót pliku.
+        Bez NumPy plik jest parsowany linia po linii.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            csr = cls._parse_text(filepath)
+            _warn_missing_neighbors(csr.missing_neighbors)
+            return csr
+
+        stat = os.stat(filepath)
+        cache_path = filepath + CACHE_SUFFIX
+        if use_cache:
+            cache = _load_sidecar(cache_path, filepath, stat, CSR_ARRAYS)
+            if cache is not None:
+                csr = cls._from_arrays(cache)
+                _warn_missing_neighbors(csr.missing_neighbors)
+                return csr
+
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        csr = cls._parse_numpy(np, data)
+        _warn_missing_neighbors(csr.missing_neighbors)
+        if use_cache:
+            _save_sidecar(cache_path, stat, hashlib.blake2b(data).hexdigest(),
+                          xs=np.frombuffer(csr.xs, dtype=np.float64), ys=np.frombuffer(csr.ys, dtype=np.float64),
+                          offsets=np.frombuffer(csr.offsets, dtype=np.int32),
+                          targets=np.frombuffer(csr.targets, dtype=np.int32),
+                          lengths=np.frombuffer(csr.lengths, dtype=np.float64),
+                          missing=np.array(csr.missing_neighbors, dtype=np.int64).reshape(-1, 2))
+        return csr
+
+    @classmethod
+    def _parse_text(cls, filepath: str) -> 'CSRGraph':
+        with open(filepath, 'r') as f:
+            n = int(f.readline())
+            xs, ys = array('d'), array('d')
+            for _ in range(n):
+                x, y = f.readline().split()
+                xs.append(int(x))
+                ys.append(int(y))
+
+            offsets, targets = array('i', [0]), array('i')
+            missing = []
+            for i in range(n):
+                parts = f.readline().split()
+                if not parts:
+                    raise ValueError(f"Brak linii sąsiedztwa węzła {i + 1} (plik jest niekompletny).")
+                for neighbor_id in map(int, parts[1:]):
+                    if 1 <= neighbor_id <= n:
+                        targets.append(neighbor_id - 1)
+                    else:
+                        missing.append((i + 1, neighbor_id))
+                offsets.append(len(targets))
+        csr = cls(array('l', range(1, n + 1)), xs, ys, offsets, targets)
+        csr.missing_neighbors = missing
+        return csr
+
+    @classmethod
+    def _parse_numpy(cls, np, data: bytes) -> 'CSRGraph':
+        """Parsuje cały plik naraz: liczby wczytuje np.fromstring, a numer linii
+        każdej liczby wynika z pozycji znaków nowej linii."""
+        buf = np.frombuffer(data, dtype=np.uint8)
+        space = (buf == ord(' ')) | (buf == ord('\n')) | (buf == ord('\r')) | (buf == ord('\t'))
+        token_starts = np.flatnonzero(~space & np.concatenate(([True], space[:-1])))
+        tokens = np.fromstring(data, dtype=np.int64, sep=' ')
+        if len(tokens) != len(token_starts):
+            raise ValueError("Plik grafu zawiera niepoprawne liczby.")
+        token_lines = np.searchsorted(np.flatnonzero(buf == ord('\n')), token_starts)
+        if len(tokens) == 0 or token_lines[0] != 0:
+            raise ValueError("Brak liczby węzłów w pierwszej linii.")
+
+        n = int(tokens[0])
+        line_counts = np.bincount(token_lines, minlength=2 * n + 1)
+        if np.any(line_counts[1:n + 1] != 2):
+            raise ValueError("Każda linia współrzędnych musi zawierać dwie liczby.")
+        absent = np.flatnonzero(line_counts[n + 1:2 * n + 1] == 0)
+        if len(absent):
+            raise ValueError(f"Brak linii sąsiedztwa węzła {int(absent[0]) + 1} (plik jest niekompletny).")
+        coords = tokens[(token_lines >= 1) & (token_lines <= n)].reshape(n, 2).astype(np.float64)
+
+        # Pierwsza liczba w linii sąsiedztwa to id węzła, pomijamy ją jak Graph.load_from_file
+        first_in_line = np.concatenate(([True], token_lines[1:] != token_lines[:-1]))
+        in_adjacency = (token_lines > n) & (token_lines <= 2 * n) & ~first_in_line
+        neighbors = tokens[in_adjacency]
+        neighbor_lines = token_lines[in_adjacency] - (n + 1)
+        valid = (neighbors >= 1) & (neighbors <= n)
+        missing = [(int(line) + 1, int(neighbor_id)) for line, neighbor_id in zip(neighbor_lines[~valid], neighbors[~valid])]
+        if missing:
+            neighbors, neighbor_lines = neighbors[valid], neighbor_lines[valid]
+
+        offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(neighbor_lines, minlength=n), out=offsets[1:])
+        targets = (neighbors - 1).astype(np.int32)
+        sources = np.repeat(np.arange(n), np.diff(offsets))
+        lengths = np.sqrt((coords[sources, 0] - coords[targets, 0])**2 + (coords[sources, 1] - coords[targets, 1])**2)
+
+        csr = cls(array('l', range(1, n + 1)),
+                  array('d', coords[:, 0].tobytes()), array('d', coords[:, 1].tobytes()),
+                  array('i', offsets.tobytes()), array('i', targets.tobytes()), array('d', lengths.tobytes()))
+        csr.missing_neighbors = missing
+        return csr
+
+    @classmethod
+    def _from_arrays(cls, arrays: Dict[str, Any]) -> 'CSRGraph':
+        n = len(arrays['xs'])
+        csr = cls(array('l', range(1, n + 1)),
+                  array('d', arrays['xs'].tobytes()), array('d', arrays['ys'].tobytes()),
+                  array('i', arrays['offsets'].tobytes()), array('i', arrays['targets'].tobytes()),
+                  array('d', arrays['lengths'].tobytes()))
+        csr.missing_neighbors = [(int(node_id), int(neighbor_id)) for node_id, neighbor_id in arrays['missing']]
+        return csr
+
+
+def dijkstra(csr: CSRGraph, source: int, reverse: bool = False) -> array:
+    """Odległości z węzła `source` do wszystkich węzłów (inf - nieosiągalne).
+
+    Przy `reverse=True` krawędzie są odwrócone, więc wynik to odległości do `source`.
+    """
+    offsets, targets, lengths = csr.reversed_arrays() if reverse else (csr.offsets, csr.targets, csr.lengths)
+    dist = array('d', [math.inf]) * len(csr)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, current = heapq.heappop(heap)
+        if d > dist[current]: continue
+        first, last = offsets[current], offsets[current + 1]
+        for neighbor, length in zip(targets[first:last], lengths[first:last]):
+            nd = d + length
+            if nd < dist[neighbor]:
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, neighbor))
+    return dist
+
+
+class Landmarks:
+    """Heurystyka ALT: odległości od i do K punktów orientacyjnych.
+
+    Z nierówności trójkąta d(v, t) >= d(L, t) - d(L, v) oraz d(v, t) >= d(v, L) - d(t, L)
+    dla każdego punktu L, więc największe z tych ograniczeń jest dopuszczalną
+    (i spójną) heurystyką dla A*.
+    """
+
+    def __init__(self, nodes: List[int], from_landmark: List[array], to_landmark: List[array]):
+        self.nodes = nodes
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+
+    @classmethod
+    def compute(cls, csr: CSRGraph, k: int = 8) -> 'Landmarks':
+        """Wybiera K punktów metodą najdalszego punktu i liczy z nich Dijkstrę w obie strony."""
+        nodes: List[int] = []
+        from_landmark: List[array] = []
+        if len(csr) == 0:
+            return cls(nodes, from_landmark, [])
+
+        # Pierwszy punkt to węzeł najdalszy od węzła o największym stopniu (zwykle leżącego
+        # w największej składowej), każdy kolejny - osiągalny węzeł najdalszy od już wybranych
+        offsets = csr.offsets
+        seed = max(range(len(csr)), key=lambda i: offsets[i + 1] - offsets[i])
+        closest = dijkstra(csr, seed)
+        for _ in range(min(k, len(csr))):
+            d, candidate = max((d, i) for i, d in enumerate(closest) if d < math.inf)
+            if d == 0.0 and nodes:
+                break
+            nodes.append(candidate)
+            dist = dijkstra(csr, candidate)
+            from_landmark.append(dist)
+            closest = array('d', map(min, closest, dist)) if len(nodes) > 1 else dist
+        to_landmark = [dijkstra(csr, node, reverse=True) for node in nodes]
+        return cls(nodes, from_landmark, to_landmark)
+
+    @classmethod
+    def load_or_compute(cls, csr: CSRGraph, filepath: str, k: int = 8) -> 'Landmarks':
+        """Jak compute, ale tablice są zapisywane obok pliku grafu (`<plik>.alt<K>.npz`)
+        i wczytywane przy kolejnych uruchomieniach. Bez NumPy tylko liczy."""
+        try:
+            import numpy as np
+        except ImportError:
+            return cls.compute(csr, k)
+
+        stat = os.stat(filepath)
+        cache_path = f"{filepath}.alt{k}.npz"
+        cache = _load_sidecar(cache_path, filepath, stat, ('nodes', 'from_landmark', 'to_landmark'))
+        if cache is not None and cache['from_landmark'].shape[1:] == (len(csr),):
+            return cls([int(i) for i in cache['nodes']],
+                       [array('d', row.tobytes()) for row in cache['from_landmark']],
+                       [array('d', row.tobytes()) for row in cache['to_landmark']])
+
+        landmarks = cls.compute(csr, k)
+        _save_sidecar(cache_path, stat, _file_digest(filepath), nodes=np.array(landmarks.nodes, dtype=np.int64),
+                      from_landmark=np.array(landmarks.from_landmark, dtype=np.float64).reshape(-1, len(csr)),
+                      to_landmark=np.array(landmarks.to_landmark, dtype=np.float64).reshape(-1, len(csr)))
+        return landmarks
+
+    def bounds_for(self, goal: int, start: Optional[int] = None, active: int = 4) -> List[Tuple[array, float, int]]:
+        """Ograniczenia dla celu `goal` jako krotki (tablica, stała, znak): h >= znak * (stała - tablica[v]).
+
+        Ograniczenia z nieskończonością (brak drogi) są pomijane. Przy podanym
+        `start` zostaje tylko `active` ograniczeń najsilniejszych w węźle startowym,
+        bo każde kolejne to dodatkowy koszt przy każdym wstawieniu do kopca.
+        """
+        bounds = []
+        for fwd, bwd in zip(self.from_landmark, self.to_landmark):
+            if fwd[goal] < math.inf:
+                bounds.append((fwd, fwd[goal], 1))
+            if bwd[goal] < math.inf:
+                bounds.append((bwd, bwd[goal], -1))
+        if start is not None and len(bounds) > active:
+            bounds.sort(key=lambda b: b[2] * (b[1] - b[0][start]), reverse=True)
+            bounds = bounds[:active]
+        return bounds
+
+
+def _alt_bound(bounds: List[Tuple[array, float, int]], node: int, h: float) -> float:
+    for dist, goal_dist, sign in bounds:
+        bound = (goal_dist - dist[node]) if sign > 0 else (dist[node] - goal_dist)
+        if bound > h:
+            h = bound
+    return h
+
+
+class ContractionHierarchy:
+    """Hierarchia skrótów (contraction hierarchies) dla wielokrotnych zapytań o najkrótszą ścieżkę.
+
+    Przetwarzanie wstępne usuwa węzły po kolei (od najmniej ważnych) i dodaje skróty
+    tam, gdzie usunięty węzeł leżał na jedynej najkrótszej ścieżce między sąsiadami.
+    Zapytanie to dwukierunkowa Dijkstra, która idzie tylko krawędziami w górę
+    hierarchii, więc odwiedza zwykle setki węzłów zamiast dziesiątek tysięcy.
+
+    Krawędzie w górę trzymane są w dwóch tablicach CSR: `up` (krawędzie v -> w,
+    ranga w > ranga v) i `down` (krawędzie u -> v zapisane przy v, ranga u > ranga v).
+    `via` to węzeł środkowy skrótu albo -1 dla krawędzi oryginalnej.
+    """
+
+    # Limit węzłów rozwijanych w jednym wyszukiwaniu świadka; mniejszy przyspiesza
+    # przetwarzanie kosztem nadmiarowych (ale poprawnych) skrótów
+    WITNESS_LIMIT = 200
+
+    def __init__(self, rank: array, up: Tuple[array, array, array, array], down: Tuple[array, array, array, array]):
+        self.rank = rank
+        self.up_offsets, self.up_targets, self.up_lengths, self.up_via = up
+        self.down_offsets, self.down_targets, self.down_lengths, self.down_via = down
+
+    def __len__(self) -> int:
+        return len(self.rank)
+
+    @classmethod
+    def build(cls, csr: CSRGraph) -> 'ContractionHierarchy':
+        """Kontrakcja węzłów w kolejności priorytetu (leniwie aktualizowanego przy zdejmowaniu z kopca)."""
+        size = len(csr)
+        out_edges: List[Dict[int, float]] = [{} for _ in range(size)]
+        in_edges: List[Dict[int, float]] = [{} for _ in range(size)]
+        offsets, targets, lengths = csr.offsets, csr.targets, csr.lengths
+        for node in range(size):
+            for neighbor, length in zip(targets[offsets[node]:offsets[node + 1]], lengths[offsets[node]:offsets[node + 1]]):
+                if neighbor != node and length < out_edges[node].get(neighbor, math.inf):
+                    out_edges[node][neighbor] = length
+                    in_edges[neighbor][node] = length
+        via: Dict[Tuple[int, int], int] = {}
+        contracted_neighbors = array('i', [0]) * size
+        level = array('i', [0]) * size
+        limit = cls.WITNESS_LIMIT
+
+        def witness_costs(source: int, skipped: int, max_cost: float, wanted: set) -> Dict[int, float]:
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap and settled < limit and wanted:
+                d, current = heapq.heappop(heap)
+                if d > dist[current]: continue
+                settled += 1
+                wanted.discard(current)
+                for neighbor, length in out_edges[current].items():
+                    nd = d + length
+                    if nd <= max_cost and neighbor != skipped and nd < dist.get(neighbor, math.inf):
+                        dist[neighbor] = nd
+                        heapq.heappush(heap, (nd, neighbor))
+            return dist
+
+        def shortcuts_for(node: int) -> List[Tuple[int, int, float]]:
+            shortcuts = []
+            outgoing = out_edges[node]
+            for source, in_length in in_edges[node].items():
+                costs = {t: in_length + length for t, length in outgoing.items() if t != source}
+                if not costs: continue
+                dist = witness_costs(source, node, max(costs.values()), set(costs))
+                shortcuts.extend((source, t, c) for t, c in costs.items() if dist.get(t, math.inf) > c)
+            return shortcuts
+
+        def priority(node: int, shortcuts: List[Tuple[int, int, float]]) -> int:
+            # Różnica krawędzi + liczba usuniętych sąsiadów + poziom w hierarchii;
+            # dwa ostatnie składniki rozkładają kontrakcję równomiernie po grafie
+            edge_difference = len(shortcuts) - len(in_edges[node]) - len(out_edges[node])
+            return edge_difference + contracted_neighbors[node] + level[node]
+
+        heap = [(priority(node, shortcuts_for(node)), node) for node in range(size)]
+        heapq.heapify(heap)
+        rank = array('i', [0]) * size
+        up: List[List[Tuple[int, float, int]]] = [[] for _ in range(size)]
+        down: List[List[Tuple[int, float, int]]] = [[] for _ in range(size)]
+        order = 0
+        while heap:
+            _, node = heapq.heappop(heap)
+            # Leniwa aktualizacja: priorytet mógł wzrosnąć od wstawienia do kopca
+            shortcuts = shortcuts_for(node)
+            current = priority(node, shortcuts)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))
+                continue
+
+            rank[node] = order
+            order += 1
+            up[node] = [(t, length, via.get((node, t), -1)) for t, length in out_edges[node].items()]
+            down[node] = [(s, length, via.get((s, node), -1)) for s, length in in_edges[node].items()]
+            for source, target, cost in shortcuts:
+                if cost < out_edges[source].get(target, math.inf):
+                    out_edges[source][target] = cost
+                    in_edges[target][source] = cost
+                    via[source, target] = node
+            for source in in_edges[node]:
+                del out_edges[source][node]
+                contracted_neighbors[source] += 1
+                level[source] = max(level[source], level[node] + 1)
+            for target in out_edges[node]:
+                del in_edges[target][node]
+                contracted_neighbors[target] += 1
+                level[target] = max(level[target], level[node] + 1)
+            out_edges[node] = in_edges[node] = {}
+
+        return cls(rank, cls._pack(up), cls._pack(down))
+
+    @staticmethod
+    def _pack(adjacency: List[List[Tuple[int, float, int]]]) -> Tuple[array, array, array, array]:
+        offsets = array('i', [0])
+        targets, lengths, vias = array('i'), array('d'), array('i')
+        for edges in adjacency:
+            for target, length, middle in edges:
+                targets.append(target)
+                lengths.append(length)
+                vias.append(middle)
+            offsets.append(len(targets))
+        return offsets, targets, lengths, vias
+
+    @classmethod
+    def load_or_compute(cls, csr: CSRGraph, filepath: str) -> 'ContractionHierarchy':
+        """Jak build, ale wynik jest zapisywany obok pliku grafu (`<plik>.ch.npz`)
+        i wczytywany przy kolejnych uruchomieniach. Bez NumPy tylko liczy."""
+        try:
+            import numpy as np
+        except ImportError:
+            return cls.build(csr)
+
+        stat = os.stat(filepath)
+        cache_path = f"{filepath}.ch.npz"
+        names = ('offsets', 'targets', 'lengths', 'via')
+        typecodes = ('i', 'i', 'd', 'i')
+        fields = ('rank',) + tuple(f'{prefix}_{name}' for prefix in ('up', 'down') for name in names)
+        cache = _load_sidecar(cache_path, filepath, stat, fields)
+        if cache is not None and cache['rank'].shape == (len(csr),):
+            return cls(array('i', cache['rank'].tobytes()),
+                       tuple(array(t, cache[f'up_{n}'].tobytes()) for t, n in zip(typecodes, names)),
+                       tuple(array(t, cache[f'down_{n}'].tobytes()) for t, n in zip(typecodes, names)))
+
+        hierarchy = cls.build(csr)
+        arrays = {}
+        for prefix in ('up', 'down'):
+            for name in names:
+                values = getattr(hierarchy, f'{prefix}_{name}')
+                arrays[f'{prefix}_{name}'] = np.frombuffer(values, dtype=np.float64 if name == 'lengths' else np.int32)
+        _save_sidecar(cache_path, stat, _file_digest(filepath), rank=np.frombuffer(hierarchy.rank, dtype=np.int32), **arrays)
+        return hierarchy
+
+    def _unpack(self, source: int, target: int, middle: int, path: List[int]):
+        """Dopisuje do `path` węzły krawędzi source -> target bez węzła source, rozwijając skróty."""
+        stack = [(source, target, middle)]
+        while stack:
+            source, target, middle = stack.pop()
+            if middle < 0:
+                path.append(target)
+                continue
+            stack.append((middle, target, self._via(middle, target)))
+            stack.append((source, middle, self._via(source, middle)))
+
+    def _via(self, source: int, target: int) -> int:
+        if self.rank[target] > self.rank[source]:
+            offsets, targets, vias, node, other = self.up_offsets, self.up_targets, self.up_via, source, target
+        else:
+            offsets, targets, vias, node, other = self.down_offsets, self.down_targets, self.down_via, target, source
+        for e in range(offsets[node], offsets[node + 1]):
+            if targets[e] == other:
+                return vias[e]
+        raise KeyError((source, target))
+
+    def search_steps(self, start: int, goal: int) -> Generator[Dict[str, Any], None, None]:
+        """Krokowa dwukierunkowa Dijkstra w górę hierarchii; zdarzenia jak w csr_search_steps.
+
+        Kierunek z mniejszym minimum w kopcu rozwija się pierwszy, a wyszukiwanie
+        kończy się, gdy oba minima są nie mniejsze od najlepszego spotkania.
+        """
+        dist = ({start: 0.0}, {goal: 0.0})
+        parent: Tuple[Dict[int, Tuple[int, int]], Dict[int, Tuple[int, int]]] = ({}, {})
+        heaps = ([(0.0, start)], [(0.0, goal)])
+        closed = (set(), set())
+        edges = ((self.up_offsets, self.up_targets, self.up_lengths, self.up_via),
+                 (self.down_offsets, self.down_targets, self.down_lengths, self.down_via))
+        best, meeting = math.inf, -1
+
+        yield {"opened": [start, goal] if start != goal else [start], "closed": [], "current": None}
+
+        while True:
+            top = [heap[0][0] if heap else math.inf for heap in heaps]
+            if min(top) >= best:
+                break
+            side = 0 if top[0] <= top[1] else 1
+            d, current = heapq.heappop(heaps[side])
+            if current in closed[side]: continue
+            closed[side].add(current)
+
+            side_dist = dist[side]
+            # Stall-on-demand: jeśli do węzła da się dojść taniej przez wyższy węzeł
+            # (krawędzią drugiej tablicy), to d nie jest jego odległością i go nie rozwijamy
+            offsets, targets, lengths, _ = edges[1 - side]
+            first, last = offsets[current], offsets[current + 1]
+            if any(side_dist.get(higher, math.inf) + length < d
+                   for higher, length in zip(targets[first:last], lengths[first:last])):
+                yield {"opened": [], "closed": [current], "current": current}
+                continue
+
+            other = dist[1 - side].get(current)
+            if other is not None and d + other < best:
+                best, meeting = d + other, current
+
+            opened = []
+            offsets, targets, lengths, vias = edges[side]
+            first, last = offsets[current], offsets[current + 1]
+            for neighbor, length, middle in zip(targets[first:last], lengths[first:last], vias[first:last]):
+                nd = d + length
+                if nd < side_dist.get(neighbor, math.inf):
+                    if neighbor not in side_dist and neighbor not in dist[1 - side]:
+                        opened.append(neighbor)
+                    side_dist[neighbor] = nd
+                    parent[side][neighbor] = (current, middle)
+                    heapq.heappush(heaps[side], (nd, neighbor))
+
+            yield {"opened": opened, "closed": [current], "current": current}
+
+        if meeting < 0:
+            yield {"no_path": True}
+            return
+
+        # Część w przód: start -> meeting, część wstecz: meeting -> goal (krawędzie
+        # wyszukiwania wstecznego są zapisane od celu, więc rozwijamy je odwrotnie)
+        chain = []
+        node = meeting
+        while node != start:
+            previous, middle = parent[0][node]
+            chain.append((previous, node, middle))
+            node = previous
+        path = [start]
+        for source, target, middle in reversed(chain):
+            self._unpack(source, target, middle, path)
+        node = meeting
+        while node != goal:
+            following, middle = parent[1][node]
+            self._unpack(node, following, middle, path)
+            node = following
+        yield {"path_found": True, "path": path, "cost": best}
+
+
+def csr_search_steps(csr: CSRGraph, start: int, goal: int, algorithm_type: str,
+                     landmarks: Optional[Landmarks] = None) -> Generator[Dict[str, Any], None, None]:
+    """Krokowe A* ("A*", f=g+h) lub zachłanne BFS ("GBFS", f=h) na indeksach węzłów CSRGraph.
+
+    Heurystyka h to odległość euklidesowa do celu, a przy podanych `landmarks`
+    większa z niej i ograniczenia ALT.
+
+    Każdy krok opisuje tylko zmiany od poprzedniego: "opened" to węzły dodane
+    do zbioru otwartego, "closed" to węzły zamknięte, a "current" to węzeł
+    właśnie rozwijany (już zamknięty). Koszt kroku nie zależy od rozmiaru zbiorów.
+
+    Stan wyszukiwania trzymany jest w tablicach lokalnych dla tego wywołania,
+    a kopiec zawiera pary (f, indeks). Poprawa g dokłada nowy wpis do kopca, a stare
+    wpisy zamkniętych już węzłów są pomijane przy zdejmowaniu (leniwe usuwanie).
+    """
+    xs, ys, offsets, targets, lengths = csr.xs, csr.ys, csr.offsets, csr.targets, csr.lengths
+    size = len(csr)
+    g = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    is_open = bytearray(size)
+    greedy = algorithm_type == "GBFS"
+    goal_x, goal_y = xs[goal], ys[goal]
+    bounds = landmarks.bounds_for(goal, start) if landmarks is not None else None
+
+    g[start] = 0.0
+    h = math.sqrt((xs[start] - goal_x)**2 + (ys[start] - goal_y)**2)
+    if bounds:
+        h = _alt_bound(bounds, start, h)
+    open_set: List[Tuple[float, int]] = [(h, start)]
+    is_open[start] = 1
+
+    yield {"opened": [start], "closed": [], "current": None}
+    opened: List[int] = []
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if closed[current]: continue
+        closed[current] = 1
+        is_open[current] = 0
+
+        yield {"opened": opened, "closed": [current], "current": current}
+        opened = []
+
+        if current == goal:
+            path = []
+            while current >= 0:
+                path.append(current)
+                current = parent[current]
+            yield {"path_found": True, "path": path[::-1], "cost": g[goal]}
+            return
+
+        current_g = g[current]
+        first, last = offsets[current], offsets[current + 1]
+        for neighbor, length in zip(targets[first:last], lengths[first:last]):
+            if closed[neighbor]: continue
+
+            tentative_g_score = current_g + length
+
+            if tentative_g_score < g[neighbor]:
+                parent[neighbor] = current
+                g[neighbor] = tentative_g_score
+                if is_open[neighbor]:
+                    if greedy: continue
+                else:
+                    is_open[neighbor] = 1
+                    opened.append(neighbor)
+                h = math.sqrt((xs[neighbor] - goal_x)**2 + (ys[neighbor] - goal_y)**2)
+                if bounds:
+                    h = _alt_bound(bounds, neighbor, h)
+                heapq.heappush(open_set, (h if greedy else tentative_g_score + h, neighbor))
+
+    yield {"no_path": True}
+    return
+
+
+def _mode_steps(csr: CSRGraph, start: int, goal: int, mode: str, landmarks: Optional[Landmarks],
+                hierarchy: Optional[ContractionHierarchy]) -> Generator[Dict[str, Any], None, None]:
+    if mode != "CH":
+        return csr_search_steps(csr, start, goal, mode, landmarks)
+    if hierarchy is None:
+        raise ValueError("Tryb CH wymaga hierarchii skrótów (ContractionHierarchy).")
+    return hierarchy.search_steps(start, goal)
+
+
+def search_steps(graph: Graph, start_node: Node, goal_node: Node, algorithm_type: str,
+                 landmarks: Optional[Landmarks] = None,
+                 hierarchy: Optional[ContractionHierarchy] = None) -> Generator[Dict[str, Any], None, None]:
+    """csr_search_steps (albo zapytanie CH) dla grafu z obiektami Node; zdarzenia zawierają węzły zamiast indeksów."""
+    csr = graph.to_csr()
+    nodes = [graph.nodes[node_id] for node_id in csr.ids]
+    for state in _mode_steps(csr, csr.index_of(start_node.id), csr.index_of(goal_node.id), algorithm_type, landmarks, hierarchy):
+        if "path" in state:
+            state["path"] = [nodes[i] for i in state["path"]]
+        else:
+            state["opened"] = [nodes[i] for i in state.get("opened", ())]
+            state["closed"] = [nodes[i] for i in state.get("closed", ())]
+            current = state.get("current")
+            state["current"] = nodes[current] if current is not None else None
+        yield state
+
+
+def search_stats(graph: Graph | CSRGraph, start: int, goal: int, mode: str = "A*",
+                 landmarks: Optional[Landmarks] = None,
+                 hierarchy: Optional[ContractionHierarchy] = None) -> Tuple[Optional[List[int]], float, int]:
+    """Jak astar, ale zwraca też liczbę rozwiniętych węzłów."""
+    csr = graph if isinstance(graph, CSRGraph) else graph.to_csr()
+    expansions = 0
+    for state in _mode_steps(csr, csr.index_of(start), csr.index_of(goal), mode, landmarks, hierarchy):
+        if state.get('current') is not None:
+            expansions += 1
+        elif state.get('path_found', False):
+            return [csr.ids[i] for i in state['path']], state['cost'], expansions
+    return None, float('inf'), expansions
+
+
+def astar(graph: Graph | CSRGraph, start: int, goal: int, mode: str = "A*",
+          landmarks: Optional[Landmarks] = None,
+          hierarchy: Optional[ContractionHierarchy] = None) -> Tuple[Optional[List[int]], float]:
+    """Szuka ścieżki między węzłami o podanych id bez wizualizacji.
+
+    `graph` to Graph albo CSRGraph, a `mode` to "A*", "GBFS" albo "CH". Opcjonalne
+    `landmarks` (Landmarks) wzmacniają heurystykę, a tryb "CH" wymaga `hierarchy`
+    (ContractionHierarchy zbudowanej dla tego grafu). Zwraca (lista id węzłów
+    ścieżki, koszt) lub (None, inf), gdy ścieżka nie istnieje.
+    """
+    path, cost, _ = search_stats(graph, start, goal, mode, landmarks, hierarchy)
+    return path, cost
+
+
+RESULT_CACHE_SIZE = 4096
+_result_cache: 'OrderedDict[Tuple[str, int, int, str], Tuple[Optional[List[int]], float]]' = OrderedDict()
+
+
+def _share_arrays(arrays: Dict[str, Any]) -> Tuple[SharedMemory, List[Tuple[str, str, int, int]]]:
+    """Kopiuje tablice do jednego bloku pamięci współdzielonej; zwraca blok i opis ich położenia."""
+    layout = []
+    size = 0
+    for name, values in arrays.items():
+        layout.append((name, values.typecode, size, len(values)))
+        size += -(-len(values) * values.itemsize // 8) * 8
+    shm = SharedMemory(create=True, size=max(size, 8))
+    for name, _, start, _ in layout:
+        data = memoryview(arrays[name]).cast('B')
+        shm.buf[start:start + len(data)] = data
+    return shm, layout
+
+
+def _attach_arrays(shm: SharedMemory, layout: List[Tuple[str, str, int, int]]) -> Dict[str, memoryview]:
+    """Widoki tablic z bloku pamięci współdzielonej (bez kopiowania)."""
+    return {name: shm.buf[start:start + count * array(typecode).itemsize].cast(typecode)
+            for name, typecode, start, count in layout}
+
+
+def _graph_arrays(csr: CSRGraph, hierarchy: Optional[ContractionHierarchy]) -> Dict[str, Any]:
+    arrays = {name: getattr(csr, name) for name in ('ids', 'xs', 'ys', 'offsets', 'targets', 'lengths')}
+    if hierarchy is not None:
+        arrays['rank'] = hierarchy.rank
+        for prefix in ('up', 'down'):
+            for name in ('offsets', 'targets', 'lengths', 'via'):
+                arrays[f'ch_{prefix}_{name}'] = getattr(hierarchy, f'{prefix}_{name}')
+    return arrays
+
+
+def _run_query(csr: CSRGraph, hierarchy: Optional[ContractionHierarchy], start: int, goal: int,
+               mode: str) -> Tuple[Optional[List[int]], float]:
+    for state in _mode_steps(csr, start, goal, mode, None, hierarchy):
+        if state.get('path_found', False):
+            return state['path'], state['cost']
+    return None, math.inf
+
+
+_worker_graph = None
+
+
+def _init_worker(name: str, layout: List[Tuple[str, str, int, int]]):
+    global _worker_graph
+    shm = SharedMemory(name=name)
+    views = _attach_arrays(shm, layout)
+    csr = CSRGraph(views['ids'], views['xs'], views['ys'], views['offsets'], views['targets'], views['lengths'])
+    hierarchy = None
+    if 'rank' in views:
+        hierarchy = ContractionHierarchy(views['rank'],
+                                         tuple(views[f'ch_up_{n}'] for n in ('offsets', 'targets', 'lengths', 'via')),
+                                         tuple(views[f'ch_down_{n}'] for n in ('offsets', 'targets', 'lengths', 'via')))
+    # Blok musi żyć tak długo jak proces, bo widoki wskazują na jego pamięć
+    _worker_graph = (shm, csr, hierarchy)
+
+
+def _worker_query(query: Tuple[int, int, str]) -> Tuple[Optional[List[int]], float, float]:
+    _, csr, hierarchy = _worker_graph
+    start = time.perf_counter()
+    path, cost = _run_query(csr, hierarchy, *query)
+    return path, cost, time.perf_counter() - start
+
+
+def batch_search(csr: CSRGraph, queries: List[Tuple[int, int, str]], processes: Optional[int] = None,
+                 hierarchy: Optional[ContractionHierarchy] = None) -> List[Tuple[Optional[List[int]], float, Optional[float]]]:
+    """Odpowiada na listę zapytań (id startu, id celu, tryb) bez wizualizacji.
+
+    Wyniki trafiają do pamięci LRU (klucz: skrót grafu, start, cel, tryb), więc
+    powtórzone zapytania nie są liczone ponownie. Przy `processes` > 1 brakujące
+    zapytania są liczone w puli procesów, a tablice grafu (i hierarchii dla trybu
+    "CH") procesy czytają z pamięci współdzielonej zamiast dostawać ich kopie.
+    Zwraca listę (lista id węzłów ścieżki lub None, koszt, czas liczenia w sekundach
+    lub None dla wyniku z pamięci podręcznej i powtórzenia zapytania z tej samej
+    partii) w kolejności zapytań.
+    """
+    if hierarchy is None and any(mode == "CH" for _, _, mode in queries):
+        raise ValueError("Tryb CH wymaga hierarchii skrótów (ContractionHierarchy).")
+
+    key = csr.key
+    results: Dict[Tuple[int, int, str], Tuple[Optional[List[int]], float, Optional[float]]] = {}
+    missing = []
+    for query in dict.fromkeys(queries):
+        cached = _result_cache.get((key, *query))
+        if cached is None:
+            missing.append(query)
+        else:
+            _result_cache.move_to_end((key, *query))
+            results[query] = (*cached, None)
+
+    tasks = [(csr.index_of(start), csr.index_of(goal), mode) for start, goal, mode in missing]
+    if processes and processes > 1 and len(tasks) > 1:
+        shm, layout = _share_arrays(_graph_arrays(csr, hierarchy))
+        try:
+            with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(shm.name, layout)) as pool:
+                computed = list(pool.map(_worker_query, tasks, chunksize=max(1, len(tasks) // (processes * 8))))
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        computed = []
+        for task in tasks:
+            start = time.perf_counter()
+            path, cost = _run_query(csr, hierarchy, *task)
+            computed.append((path, cost, time.perf_counter() - start))
+
+    for query, (path, cost, seconds) in zip(missing, computed):
+        ids = [csr.ids[i] for i in path] if path is not None else None
+        results[query] = (ids, cost, seconds)
+        _result_cache[(key, *query)] = (ids, cost)
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+    # Powtórzenie zapytania w tej samej partii liczone jest raz, więc kolejne kopie
+    # to trafienia w pamięć podręczną (czas None), a nie osobne pomiary
+    answered = []
+    seen = set()
+    for query in queries:
+        path, cost, seconds = results[query]
+        answered.append((path, cost, None if query in seen else seconds))
+        seen.add(query)
+    return answered
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Percentyl metodą najbliższej rangi z posortowanej listy."""
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wsadowe wyszukiwanie ścieżek w grafie z cw2 (bez GUI).")
+    parser.add_argument('graf', help="plik grafu w formacie Graph.load_from_file")
+    parser.add_argument('zapytania', help="plik z zapytaniami 'start cel [tryb]' w kolejnych liniach")
+    parser.add_argument('--mode', choices=("A*", "GBFS", "CH"), default="A*",
+                        help="tryb dla zapytań bez podanego trybu (domyślnie A*)")
+    parser.add_argument('--processes', type=int, default=None, help="liczba procesów liczących zapytania")
+    parser.add_argument('--format', choices=("csv", "jsonl"), default="csv", help="format wyników (domyślnie csv)")
+    parser.add_argument('--output', metavar='PLIK', help="plik wyników (domyślnie standardowe wyjście)")
+    args = parser.parse_args()
+
+    csr = CSRGraph.load_from_file(args.graf)
+    queries = []
+    with open(args.zapytania, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            parts = line.split()
+            if not parts or parts[0].startswith('#'): continue
+            mode = parts[2].upper() if len(parts) > 2 else args.mode
+            if mode not in ("A*", "GBFS", "CH"):
+                parser.error(f"nieznany tryb '{parts[2]}' w pliku zapytań")
+            try:
+                start, goal = int(parts[0]), int(parts[1])
+            except (ValueError, IndexError):
+                parser.error(f"linia {line_no} pliku zapytań: oczekiwano 'start cel [tryb]', podano '{line.strip()}'")
+            for node_id in (start, goal):
+                try:
+                    csr.index_of(node_id)
+                except KeyError:
+                    parser.error(f"linia {line_no} pliku zapytań: węzeł {node_id} nie istnieje w grafie")
+            queries.append((start, goal, mode))
+
+    hierarchy = None
+    if any(mode == "CH" for _, _, mode in queries):
+        hierarchy = ContractionHierarchy.load_or_compute(csr, args.graf)
+
+    started = time.perf_counter()
+    results = batch_search(csr, queries, args.processes, hierarchy)
+    elapsed = time.perf_counter() - started
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(("start", "cel", "tryb", "koszt", "sciezka"))
+            for (start, goal, mode), (path, cost, _) in zip(queries, results):
+                writer.writerow((start, goal, mode, f"{cost:.6f}" if path is not None else "",
+                                 " ".join(map(str, path)) if path is not None else ""))
+        else:
+            for (start, goal, mode), (path, cost, _) in zip(queries, results):
+                out.write(json.dumps({"start": start, "goal": goal, "mode": mode,
+                                      "cost": cost if path is not None else None, "path": path}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    latencies = sorted(seconds * 1e3 for _, _, seconds in results if seconds is not None)
+    hits = len(results) - len(latencies)
+    print(f"zapytania: {len(queries)} (z pamięci podręcznej: {hits}), czas: {elapsed:.3f} s, "
+          f"przepustowość: {len(queries) / elapsed if elapsed else 0:.1f} zapytań/s", file=sys.stderr)
+    if latencies:
+        print("opóźnienie [ms]: " + " ".join(f"p{q}={_percentile(latencies, q):.3f}" for q in (50, 90, 99))
+              + f" max={latencies[-1]:.3f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import argparse
 import random
 
+try:
+    import numpy as np
+except ImportError:  # potrzebny tylko w wersji --numpy
+    np = None
+
 N = 8
 POPULATION_SIZE = 100
 MAX_ITERATIONS = 10000
@@ -7,12 +13,65 @@ CROSSOVER_RATE = 0.8
 MUTATION_RATE = 0.2
 
 def calculate_fitness(individual):
-    collisions = 0
-    for i in range(N):
-        for j in range(i + 1, N):
-            if abs(i - j) == abs(individual[i] - individual[j]):
-                collisions += 1
-    return collisions
+    if isinstance(individual, Individual):
+        return individual.fitness
+    return Individual(individual).fitness
+
+class Individual:
+    """Ustawienie hetmanów z licznikami zajęcia 2N-1 przekątnych i 2N-1 przekątnych przeciwnych.
+
+    Liczba par bijących się hetmanów to suma c*(c-1)/2 po licznikach, więc
+    pełne obliczenie kosztuje O(N), a zamiana dwóch hetmanów zmienia tylko
+    cztery liczniki na każdym z kierunków i aktualizuje ocenę w O(1).
+    """
+
+    __slots__ = ('genes', 'diagonals', 'anti_diagonals', 'fitness')
+
+    def __init__(self, genes):
+        n = len(genes)
+        self.genes = list(genes)
+        self.diagonals = [0] * (2 * n - 1)
+        self.anti_diagonals = [0] * (2 * n - 1)
+        for row, col in enumerate(self.genes):
+            self.diagonals[row - col + n - 1] += 1
+            self.anti_diagonals[row + col] += 1
+        self.fitness = sum(c * (c - 1) // 2 for c in self.diagonals) + sum(c * (c - 1) // 2 for c in self.anti_diagonals)
+
+    def __len__(self):
+        return len(self.genes)
+
+    def __getitem__(self, index):
+        return self.genes[index]
+
+    def __iter__(self):
+        return iter(self.genes)
+
+    def copy(self):
+        clone = Individual.__new__(Individual)
+        clone.genes = self.genes[:]
+        clone.diagonals = self.diagonals[:]
+        clone.anti_diagonals = self.anti_diagonals[:]
+        clone.fitness = self.fitness
+        return clone
+
+    def _move(self, row, col, step):
+        # Zdjęcie hetmana z linii z c hetmanami usuwa c-1 par, dołożenie do linii z c hetmanami dodaje c par.
+        n = len(self.genes)
+        for counts, line in ((self.diagonals, row - col + n - 1), (self.anti_diagonals, row + col)):
+            if step > 0:
+                self.fitness += counts[line]
+                counts[line] += 1
+            else:
+                counts[line] -= 1
+                self.fitness -= counts[line]
+
+    def swap(self, idx1, idx2):
+        col1, col2 = self.genes[idx1], self.genes[idx2]
+        self._move(idx1, col1, -1)
+        self._move(idx2, col2, -1)
+        self._move(idx1, col2, 1)
+        self._move(idx2, col1, 1)
+        self.genes[idx1], self.genes[idx2] = col2, col1
 
 def initialize_population(size):
     population = []
@@ -59,7 +118,10 @@ def crossover_ox(parent1, parent2):
 def mutate_swap(individual):
     idx1, idx2 = get_two_unique_indices(N)
     
-    individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
+    if isinstance(individual, Individual):
+        individual.swap(idx1, idx2)
+    else:
+        individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
     return individual
 
 def selection(population, fitnesses, size):
@@ -68,7 +130,7 @@ def selection(population, fitnesses, size):
     return elite_population
 
 def solve_n_queens_ga():
-    population = initialize_population(POPULATION_SIZE)
+    population = [Individual(ind) for ind in initialize_population(POPULATION_SIZE)]
     best_solution = None
     best_fitness = float('inf')
     
@@ -78,7 +140,7 @@ def solve_n_queens_ga():
         
         if min_fitness < best_fitness:
             best_fitness = min_fitness
-            best_solution = population[fitnesses.index(min_fitness)]
+            best_solution = population[fitnesses.index(min_fitness)].genes[:]
             print(f"Iteracja: {iteration + 1}. Minimalny błąd: {best_fitness}")
             
         if best_fitness == 0:
@@ -92,9 +154,9 @@ def solve_n_queens_ga():
             p1, p2 = random.choices(selected_population, k=2)
             
             if random.random() < CROSSOVER_RATE:
-                c1, c2 = crossover_ox(p1, p2)
+                c1, c2 = map(Individual, crossover_ox(p1, p2))
             else:
-                c1, c2 = p1[:], p2[:]
+                c1, c2 = p1.copy(), p2.copy()
                 
             if random.random() < MUTATION_RATE:
                 c1 = mutate_swap(c1)
@@ -110,23 +172,139 @@ def solve_n_queens_ga():
     print(f"Iteracja: {MAX_ITERATIONS}. Osiągnięto limit iteracji. Błąd końcowy: {best_fitness}")
     return best_solution, MAX_ITERATIONS
 
+def batch_fitness(population):
+    """Liczba par bijących się hetmanów dla każdego wiersza tablicy P x N naraz.
+
+    Hetmany na tej samej przekątnej mają równe wiersz-kolumna (albo wiersz+kolumna
+    dla przeciwnej), więc wystarczy zliczyć zajęcie każdej przekątnej (bincount)
+    i zsumować pary c*(c-1)/2.
+    """
+    size, n = population.shape
+    rows = np.arange(n)
+    offsets = (np.arange(size) * (2 * n - 1))[:, None]
+    collisions = np.zeros(size, dtype=np.int64)
+    for diagonals in (rows - population + n - 1, rows + population):
+        counts = np.bincount((diagonals + offsets).ravel(), minlength=size * (2 * n - 1)).reshape(size, 2 * n - 1)
+        collisions += (counts * (counts - 1) // 2).sum(axis=1)
+    return collisions
+
+def random_segments(rng, size, n):
+    """Dla każdego osobnika dwa różne indeksy 0..n-1 w kolejności rosnącej (jak get_two_unique_indices)."""
+    first = rng.integers(0, n, size)
+    second = (first + rng.integers(1, n, size)) % n
+    return np.minimum(first, second), np.maximum(first, second)
+
+def batch_crossover_ox(parents1, parents2, rng):
+    """Krzyżowanie OX wszystkich par naraz; zwraca dzieci jak crossover_ox (child1 od parents1).
+
+    Dziecko dostaje odcinek [start, end) rodzica pierwszego, a resztę pól, od pozycji
+    end z zawinięciem, wypełniają w kolejności geny drugiego rodzica czytane od end,
+    z pominięciem tych już obecnych w odcinku.
+    """
+    size, n = parents1.shape
+    start, end = random_segments(rng, size, n)
+    rows = np.arange(size)[:, None]
+    positions = (end[:, None] + np.arange(n)) % n
+    in_segment = (np.arange(n) >= start[:, None]) & (np.arange(n) < end[:, None])
+    # Pozycje od end do końca i od początku do start - 1 to dokładnie pola spoza odcinka.
+    outside = np.arange(n) < (n - (end - start))[:, None]
+
+    children = []
+    for first, second in ((parents1, parents2), (parents2, parents1)):
+        taken = np.zeros((size, n), dtype=bool)
+        taken[rows, first] = in_segment
+        donor = second[rows, positions]
+        # Sortowanie stabilne przesuwa geny spoza odcinka na początek, zachowując ich kolejność.
+        donor = donor[rows, np.argsort(taken[rows, donor], axis=1, kind='stable')]
+        child = np.empty_like(first)
+        child[rows, positions] = np.where(outside, donor, first[rows, positions])
+        children.append(child)
+    return children[0], children[1]
+
+def batch_mutate_swap(population, mask, rng):
+    """Zamienia miejscami dwa różne geny w wierszach wybranych przez maskę (w miejscu)."""
+    rows = np.flatnonzero(mask)
+    idx1, idx2 = random_segments(rng, len(rows), population.shape[1])
+    population[rows, idx1], population[rows, idx2] = population[rows, idx2], population[rows, idx1]
+    return population
+
+def solve_n_queens_ga_numpy(n=N, population_size=POPULATION_SIZE, max_iterations=MAX_ITERATIONS, seed=None):
+    """Ten sam algorytm co solve_n_queens_ga, ale cała populacja to tablica P x N przetwarzana wektorowo."""
+    if np is None:
+        raise ImportError("Wersja wektorowa wymaga pakietu numpy (pip install numpy).")
+    rng = np.random.default_rng(seed)
+    population = rng.permuted(np.tile(np.arange(n), (population_size, 1)), axis=1)
+    best_solution = None
+    best_fitness = float('inf')
+    pairs = (population_size + 1) // 2
+
+    for iteration in range(max_iterations):
+        fitnesses = batch_fitness(population)
+        best_index = int(np.argmin(fitnesses))
+
+        if fitnesses[best_index] < best_fitness:
+            best_fitness = int(fitnesses[best_index])
+            best_solution = population[best_index].tolist()
+            print(f"Iteracja: {iteration + 1}. Minimalny błąd: {best_fitness}")
+
+        if best_fitness == 0:
+            print(f"Iteracja: {iteration + 1} - odnaleziono ustawienie!")
+            return best_solution, iteration + 1
+
+        selected_population = population[np.argsort(fitnesses, kind='stable')[:population_size]]
+        parents1 = selected_population[rng.integers(0, len(selected_population), pairs)]
+        parents2 = selected_population[rng.integers(0, len(selected_population), pairs)]
+
+        crossed = rng.random(pairs) < CROSSOVER_RATE
+        c1, c2 = batch_crossover_ox(parents1, parents2, rng)
+        c1 = np.where(crossed[:, None], c1, parents1)
+        c2 = np.where(crossed[:, None], c2, parents2)
+        batch_mutate_swap(c1, rng.random(pairs) < MUTATION_RATE, rng)
+        batch_mutate_swap(c2, rng.random(pairs) < MUTATION_RATE, rng)
+
+        population = np.stack((c1, c2), axis=1).reshape(-1, n)[:population_size]
+
+    print(f"Iteracja: {max_iterations}. Osiągnięto limit iteracji. Błąd końcowy: {best_fitness}")
+    return best_solution, max_iterations
+
 def print_board(solution):
     if solution is None:
         print("Brak rozwiązania do wyświetlenia.")
         return
     
+    n = len(solution)
     print(f"Lista: {', '.join(map(str, solution))}")
 
-    print("\n   " + "".join(chr(ord('A') + i) for i in range(N)))
-    for i in range(N):
+    print("\n   " + "".join(chr(ord('A') + i) for i in range(n)))
+    for i in range(n):
         row = str(i + 1) + " "
-        for j in range(N):
+        for j in range(n):
             if solution[i] == j:
                 row += "X"
             else:
                 row += "."
         print(row)
 
-final_solution, final_iteration = solve_n_queens_ga()
-if final_solution is not None:
-    print_board(final_solution)
\ No newline at end of file
+def main():
+    global N, POPULATION_SIZE, MAX_ITERATIONS
+    parser = argparse.ArgumentParser(description="Problem N hetmanów rozwiązywany algorytmem genetycznym.")
+    parser.add_argument('--n', type=int, default=N, help=f"liczba hetmanów (domyślnie {N})")
+    parser.add_argument('--population', type=int, default=POPULATION_SIZE, help="wielkość populacji")
+    parser.add_argument('--iterations', type=int, default=MAX_ITERATIONS, help="limit iteracji")
+    parser.add_argument('--numpy', action='store_true', help="przetwarzaj całą populację wektorowo (numpy)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    if args.numpy and np is None:
+        parser.error("--numpy wymaga pakietu numpy (pip install numpy)")
+
+    if args.numpy:
+        final_solution, final_iteration = solve_n_queens_ga_numpy(args.n, args.population, args.iterations, args.seed)
+    else:
+        N, POPULATION_SIZE, MAX_ITERATIONS = args.n, args.population, args.iterations
+        random.seed(args.seed)
+        final_solution, final_iteration = solve_n_queens_ga()
+    if final_solution is not None:
+        print_board(final_solution)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 PLAYER_X = 'X'
 PLAYER_O = 'O'
 EMPTY = ' '
 
 MAX_DEPTH_INF = float('inf')
+DEFAULT_TIME_LIMIT = 2.0
 
 class TicTacToe:
     def __init__(self, size=3):
@@ -48,60 +54,606 @@ class TicTacToe:
     def is_terminal(self):
         return self.get_winner() is not None or self.is_board_full()
 
-def minimax(game, depth, is_maximizing_player, max_depth):
-    
-    winner = game.get_winner()
-    if winner == PLAYER_O:
-        return 10 + depth
-    elif winner == PLAYER_X:
-        return -10 - depth
-    elif game.is_board_full():
+
+def line_masks(size):
+    """Maski bitowe wszystkich wierszy, kolumn i obu przekątnych (pole (r, c) to bit r*size+c)."""
+    rows = [sum(1 << (r * size + c) for c in range(size)) for r in range(size)]
+    cols = [sum(1 << (r * size + c) for r in range(size)) for c in range(size)]
+    diagonal = sum(1 << (i * size + i) for i in range(size))
+    anti_diagonal = sum(1 << (i * size + size - 1 - i) for i in range(size))
+    return tuple(rows + cols + [diagonal, anti_diagonal])
+
+
+class BitboardTicTacToe(TicTacToe):
+    """Plansza zapisana jako dwie liczby całkowite - po jednym bicie na pole dla każdego gracza.
+
+    Sprawdzenie wygranej to kilka operacji AND na gotowych maskach linii,
+    a pełna plansza to porównanie sumy bitów z maską wszystkich pól.
+    Minimax działa bezpośrednio na tych liczbach, bez kopiowania planszy.
+    """
+
+    def __init__(self, size=3):
+        if size < 3:
+            raise ValueError("Rozmiar planszy musi być co najmniej 3x3.")
+        self.size = size
+        self.bits = {PLAYER_X: 0, PLAYER_O: 0}
+        self.lines = line_masks(size)
+        self.full_mask = (1 << size * size) - 1
+        self.cells = tuple(1 << i for i in range(size * size))
+        self.current_player = PLAYER_X
+
+    @property
+    def board(self):
+        x, o = self.bits[PLAYER_X], self.bits[PLAYER_O]
+        return [[PLAYER_X if x >> (r * self.size + c) & 1 else PLAYER_O if o >> (r * self.size + c) & 1 else EMPTY
+                 for c in range(self.size)] for r in range(self.size)]
+
+    def is_valid_move(self, row, col):
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False
+        return not (self.bits[PLAYER_X] | self.bits[PLAYER_O]) >> (row * self.size + col) & 1
+
+    def make_move(self, row, col, player):
+        bit = 1 << (row * self.size + col)
+        self.bits[PLAYER_X] &= ~bit
+        self.bits[PLAYER_O] &= ~bit
+        if player != EMPTY:
+            self.bits[player] |= bit
+
+    def get_winner(self):
+        x, o = self.bits[PLAYER_X], self.bits[PLAYER_O]
+        for mask in self.lines:
+            if x & mask == mask:
+                return PLAYER_X
+            if o & mask == mask:
+                return PLAYER_O
+        return None
+
+    def is_board_full(self):
+        return self.bits[PLAYER_X] | self.bits[PLAYER_O] == self.full_mask
+
+
+def as_bitboard(game):
+    """Zwraca grę w postaci bitowej (kopię, jeśli `game` trzyma planszę jako listę list)."""
+    if isinstance(game, BitboardTicTacToe):
+        return game
+    bitboard = BitboardTicTacToe(game.size)
+    for r, row in enumerate(game.board):
+        for c, cell in enumerate(row):
+            if cell != EMPTY:
+                bitboard.make_move(r, c, cell)
+    bitboard.current_player = game.current_player
+    return bitboard
+
+def _minimax_bits(x, o, depth, is_maximizing_player, max_depth, lines, full_mask, cells):
+    for mask in lines:
+        if o & mask == mask:
+            return 10 + depth
+        if x & mask == mask:
+            return -10 - depth
+    occupied = x | o
+    if occupied == full_mask:
         return 0
-    
-    if depth == max_depth: 
+
+    if depth == max_depth:
         return 0
 
     if is_maximizing_player:
         max_eval = -math.inf
-        for r in range(game.size):
-            for c in range(game.size):
-                if game.is_valid_move(r, c):
-                    game.make_move(r, c, PLAYER_O)
-                    eval = minimax(game, depth + 1, False, max_depth)
-                    game.make_move(r, c, EMPTY)
-                    max_eval = max(max_eval, eval)
+        for bit in cells:
+            if not occupied & bit:
+                eval = _minimax_bits(x, o | bit, depth + 1, False, max_depth, lines, full_mask, cells)
+                if eval > max_eval:
+                    max_eval = eval
         return max_eval
 
     else:
         min_eval = math.inf
-        for r in range(game.size):
-            for c in range(game.size):
-                if game.is_valid_move(r, c):
-                    game.make_move(r, c, PLAYER_X)
-                    eval = minimax(game, depth + 1, True, max_depth)
-                    game.make_move(r, c, EMPTY)
-                    min_eval = min(min_eval, eval)
+        for bit in cells:
+            if not occupied & bit:
+                eval = _minimax_bits(x | bit, o, depth + 1, True, max_depth, lines, full_mask, cells)
+                if eval < min_eval:
+                    min_eval = eval
         return min_eval
 
-def find_best_move(game, max_depth):
-    best_eval = -math.inf
-    best_move = None
-    
-    for r in range(game.size):
-        for c in range(game.size):
-            if game.is_valid_move(r, c):
-                
-                game.make_move(r, c, PLAYER_O)
-                
-                eval = minimax(game, 0, False, max_depth)
-                
-                game.make_move(r, c, EMPTY)
-
-                if eval > best_eval:
-                    best_eval = eval
-                    best_move = (r, c)
-    
-    return best_move
+def minimax(game, depth, is_maximizing_player, max_depth):
+    game = as_bitboard(game)
+    return _minimax_bits(game.bits[PLAYER_X], game.bits[PLAYER_O], depth, is_maximizing_player, max_depth,
+                         game.lines, game.full_mask, game.cells)
+
+def symmetries(size):
+    """Osiem symetrii planszy (obroty i odbicia) jako krotki: pole -> pole obrazu."""
+    n = size - 1
+    maps = [
+        lambda r, c: (r, c), lambda r, c: (c, n - r), lambda r, c: (n - r, n - c), lambda r, c: (n - c, r),
+        lambda r, c: (r, n - c), lambda r, c: (n - r, c), lambda r, c: (c, r), lambda r, c: (n - c, n - r),
+    ]
+    return [tuple(image[0] * size + image[1] for image in (f(*divmod(i, size)) for i in range(size * size)))
+            for f in maps]
+
+
+class ZobristKeys:
+    """Klucze Zobrista dla wszystkich ośmiu symetrii naraz.
+
+    Każdy z ośmiu 64-bitowych skrótów zajmuje własne pole jednej dużej liczby,
+    więc ruch aktualizuje je wszystkie jednym XOR-em. Kluczem kanonicznym
+    (wspólnym dla obróconych i odbitych pozycji) jest najmniejszy z nich.
+    """
+
+    SEED = 20240601
+    FIELD_BITS = 64
+
+    def __init__(self, size):
+        rng = random.Random(self.SEED + size)
+        base = {player: [rng.getrandbits(self.FIELD_BITS) for _ in range(size * size)]
+                for player in (PLAYER_X, PLAYER_O)}
+        images = symmetries(size)
+        self.shifts = tuple(range(0, len(images) * self.FIELD_BITS, self.FIELD_BITS))
+        self.field_mask = (1 << self.FIELD_BITS) - 1
+        self.keys = {player: [sum(base[player][image[i]] << shift for image, shift in zip(images, self.shifts))
+                              for i in range(size * size)]
+                     for player in (PLAYER_X, PLAYER_O)}
+
+    def hash(self, x, o):
+        value = 0
+        for player, bits in ((PLAYER_X, x), (PLAYER_O, o)):
+            for cell, key in enumerate(self.keys[player]):
+                if bits >> cell & 1:
+                    value ^= key
+        return value
+
+    def canonical(self, value):
+        mask = self.field_mask
+        return min(value >> shift & mask for shift in self.shifts)
+
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class TranspositionTable:
+    """Tablica transpozycji o stałym rozmiarze (2**bits wpisów) indeksowana kluczem Zobrista.
+
+    Wpis to (klucz, ocena, głębokość, rodzaj oceny, wiek). Nowy wpis zastępuje
+    stary, jeśli stary pochodzi z wcześniejszej iteracji albo był liczony
+    płycej; w przeciwnym razie zostaje ten, w który włożono więcej pracy.
+    """
+
+    def __init__(self, bits=20):
+        self.mask = (1 << bits) - 1
+        self.entries = [None] * (1 << bits)
+        self.age = 0
+        self.hits = 0
+        self.stores = 0
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.entries)
+
+    def new_iteration(self):
+        self.age += 1
+
+    def probe(self, key):
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, value, depth, bound):
+        slot = key & self.mask
+        old = self.entries[slot]
+        if old is None or old[4] != self.age or depth >= old[2]:
+            self.entries[slot] = (key, value, depth, bound, self.age)
+            self.stores += 1
+
+
+class SearchTimeout(Exception):
+    """Przekroczono limit czasu przeszukiwania."""
+
+
+class SearchBoard:
+    """Plansza robocza przeszukiwania ze stosem ruchów zmienianym w miejscu.
+
+    Puste pola tworzą listę dwukierunkową (w kolejności od środka planszy),
+    więc generowanie ruchów kosztuje O(liczba pustych pól), a wycofanie ruchu
+    przywraca pole na jego miejsce w O(1). Liczniki pionów w każdej linii
+    pozwalają wykryć wygraną, sprawdzając tylko linie przez ostatni ruch,
+    i na bieżąco utrzymują heurystyczną ocenę pozycji.
+    """
+
+    def __init__(self, game, zobrist=None):
+        game = as_bitboard(game)
+        size = self.size = game.size
+        cells = size * size
+        self.cell_lines = tuple(tuple(i for i, mask in enumerate(game.lines) if mask >> cell & 1)
+                                for cell in range(cells))
+        self.counts = {PLAYER_X: [0] * len(game.lines), PLAYER_O: [0] * len(game.lines)}
+        self.scale = len(game.lines) * size * size
+        self.score = 0
+        self.occupied = 0
+        self.moves = []
+        self.zobrist = zobrist
+        self.hash = 0
+
+        center = (size - 1) / 2
+        self.order = tuple(sorted(range(cells), key=lambda cell: abs(cell // size - center) + abs(cell % size - center)))
+        self.head = cells
+        self.next = [self.head] * (cells + 1)
+        self.prev = [self.head] * (cells + 1)
+        self.empty = 0
+        last = self.head
+        for cell in self.order:
+            self.prev[cell], self.next[last] = last, cell
+            last = cell
+            self.empty += 1
+        self.next[last], self.prev[self.head] = self.head, last
+
+        for player in (PLAYER_X, PLAYER_O):
+            for cell in range(cells):
+                if game.bits[player] >> cell & 1:
+                    self.play(cell, player)
+        self.moves.clear()
+
+    def empty_cells(self):
+        """Puste pola od środka; wolno grać i cofać ruchy w trakcie iteracji."""
+        cell = self.next[self.head]
+        while cell != self.head:
+            yield cell
+            cell = self.next[cell]
+
+    def play(self, cell, player):
+        """Stawia pion gracza na polu; zwraca True, jeśli ruch zamyka linię."""
+        mine = self.counts[player]
+        theirs = self.counts[PLAYER_X if player == PLAYER_O else PLAYER_O]
+        sign = 1 if player == PLAYER_O else -1
+        won = False
+        for line in self.cell_lines[cell]:
+            count = mine[line]
+            if not theirs[line]:
+                self.score += sign * (2 * count + 1)
+            elif not count:
+                self.score += sign * theirs[line] * theirs[line]
+            mine[line] = count + 1
+            if count + 1 == self.size:
+                won = True
+
+        self.next[self.prev[cell]] = self.next[cell]
+        self.prev[self.next[cell]] = self.prev[cell]
+        self.empty -= 1
+        self.occupied |= 1 << cell
+        if self.zobrist is not None:
+            self.hash ^= self.zobrist.keys[player][cell]
+        self.moves.append((cell, player))
+        return won
+
+    def undo(self):
+        cell, player = self.moves.pop()
+        mine = self.counts[player]
+        theirs = self.counts[PLAYER_X if player == PLAYER_O else PLAYER_O]
+        sign = 1 if player == PLAYER_O else -1
+        for line in self.cell_lines[cell]:
+            count = mine[line] - 1
+            mine[line] = count
+            if not theirs[line]:
+                self.score -= sign * (2 * count + 1)
+            elif not count:
+                self.score -= sign * theirs[line] * theirs[line]
+
+        self.next[self.prev[cell]] = cell
+        self.prev[self.next[cell]] = cell
+        self.empty += 1
+        self.occupied &= ~(1 << cell)
+        if self.zobrist is not None:
+            self.hash ^= self.zobrist.keys[player][cell]
+
+    def evaluate(self):
+        """Ocena heurystyczna w przedziale (-1, 1): linie otwarte dla O minus linie otwarte dla X.
+
+        Linia zajęta tylko przez jednego gracza liczy się jako kwadrat liczby jego pionów.
+        Wartość jest mniejsza od każdej wygranej (co najmniej 10), więc nie zmienia ocen rozstrzygniętych.
+        """
+        return self.score / self.scale
+
+
+class AlphaBetaSearch:
+    """Alfa-beta z porządkowaniem ruchów (najpierw środek i ruchy-zabójcy) i pogłębianiem iteracyjnym.
+
+    Wygrane i remisy są oceniane tak samo jak w `minimax`; na granicy głębokości
+    zamiast 0 zwracana jest ocena heurystyczna `SearchBoard.evaluate`.
+    Z `table_bits` różnym od None pozycje są zapamiętywane w tablicy
+    transpozycji wspólnej dla symetrycznych odpowiedników.
+    """
+
+    CHECK_EVERY = 1024
+    TABLE_BITS = 20
+
+    def __init__(self, game, time_limit=None, table_bits=TABLE_BITS):
+        game = as_bitboard(game)
+        self.size = game.size
+        if table_bits is None:
+            self.zobrist = self.table = None
+        else:
+            self.zobrist = ZobristKeys(game.size)
+            self.table = TranspositionTable(table_bits)
+        self.board = SearchBoard(game, self.zobrist)
+        if self.zobrist is not None:
+            self.board.hash = self.zobrist.hash(game.bits[PLAYER_X], game.bits[PLAYER_O])
+        self.winner = game.get_winner()
+        self.killers = {}
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.nodes = 0
+        self.depth_reached = None
+        self._cutoff = False
+        # Wspólne alfa korzenia (multiprocessing.Value) przy przeszukiwaniu równoległym;
+        # co CHECK_EVERY węzłów jego wartość podnosi root_alpha, a z nim alfa w każdym węźle.
+        self.shared_alpha = None
+        self.root_alpha = -math.inf
+
+    def _moves(self, depth):
+        board = self.board
+        killers = self.killers.get(depth, ())
+        for cell in killers:
+            if not board.occupied >> cell & 1:
+                yield cell
+        for cell in board.empty_cells():
+            if cell not in killers:
+                yield cell
+
+    def _store_killer(self, depth, cell):
+        killers = self.killers.get(depth, ())
+        if cell not in killers:
+            self.killers[depth] = (cell,) + killers[:1]
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes % self.CHECK_EVERY == 0:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchTimeout
+            if self.shared_alpha is not None and self.shared_alpha.value > self.root_alpha:
+                self.root_alpha = self.shared_alpha.value
+
+    def alphabeta(self, depth, alpha, beta, is_maximizing_player, max_depth):
+        """Ocena pozycji na planszy roboczej; ostatni ruch nie zamknął żadnej linii."""
+        self._tick()
+        if self.root_alpha > alpha:
+            alpha = self.root_alpha
+        board = self.board
+        if not board.empty:
+            return 0
+
+        if depth == max_depth:
+            self._cutoff = True
+            return board.evaluate()
+
+        # Ta sama pozycja zawsze leży na tej samej głębokości (liczba pionów),
+        # więc oceny z tablicy nie wymagają przesuwania.
+        table = self.table
+        remaining = max_depth - depth
+        if table is not None:
+            key = self.zobrist.canonical(board.hash)
+            entry = table.probe(key)
+            if entry is not None and entry[2] >= remaining:
+                value, bound = entry[1], entry[3]
+                if bound == EXACT or (bound == LOWER_BOUND and value >= beta) or (bound == UPPER_BOUND and value <= alpha):
+                    if entry[2] != math.inf:
+                        self._cutoff = True
+                    return value
+            alpha_orig, beta_orig = alpha, beta
+            outer_cutoff, self._cutoff = self._cutoff, False
+
+        if is_maximizing_player:
+            best = -math.inf
+            for cell in self._moves(depth):
+                if board.play(cell, PLAYER_O):
+                    self._tick()
+                    eval = 10 + depth + 1
+                else:
+                    eval = self.alphabeta(depth + 1, alpha, beta, False, max_depth)
+                board.undo()
+                if eval > best:
+                    best = eval
+                if best > alpha:
+                    alpha = best
+                if alpha >= beta:
+                    self._store_killer(depth, cell)
+                    break
+
+        else:
+            best = math.inf
+            for cell in self._moves(depth):
+                if board.play(cell, PLAYER_X):
+                    self._tick()
+                    eval = -10 - depth - 1
+                else:
+                    eval = self.alphabeta(depth + 1, alpha, beta, True, max_depth)
+                board.undo()
+                if eval < best:
+                    best = eval
+                if best < beta:
+                    beta = best
+                if alpha >= beta:
+                    self._store_killer(depth, cell)
+                    break
+
+        if table is not None:
+            # Poddrzewa mogły być liczone z alfa podniesionym w trakcie przez inne procesy
+            if best <= alpha_orig or best <= self.root_alpha:
+                bound = UPPER_BOUND
+            elif best >= beta_orig:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            # Poddrzewo rozstrzygnięte bez cięcia głębokości jest ważne dla każdej głębokości.
+            table.store(key, best, remaining if self._cutoff else math.inf, bound)
+            self._cutoff = self._cutoff or outer_cutoff
+        return best
+
+    def search_root(self, max_depth, first=None):
+        """Ocenia ruchy O w korzeniu do głębokości `max_depth`; zwraca (ocena, pole ruchu)."""
+        board = self.board
+        moves = list(board.empty_cells())
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        if self.table is not None:
+            self.table.new_iteration()
+
+        best_eval = -math.inf
+        best_cell = None
+        for cell in moves:
+            eval = self.search_move(cell, max_depth, best_eval)
+            if eval > best_eval:
+                best_eval = eval
+                best_cell = cell
+        return best_eval, best_cell
+
+    def search_move(self, cell, max_depth, alpha=-math.inf):
+        """Ocena ruchu O na pole `cell`; wynik nie większy niż `alpha` jest tylko ograniczeniem górnym."""
+        board = self.board
+        if board.play(cell, PLAYER_O):
+            self._tick()
+            eval = 10
+        else:
+            eval = self.alphabeta(0, alpha, math.inf, False, max_depth)
+        board.undo()
+        return eval
+
+    def run(self, max_depth=MAX_DEPTH_INF):
+        """Pogłębianie iteracyjne aż do `max_depth` lub końca czasu; zwraca (ocena, (wiersz, kolumna))."""
+        if self.winner is not None or not self.board.empty:
+            return None, None
+
+        best_eval, best_cell = None, next(self.board.empty_cells())
+        depth = 0
+        while depth <= max_depth:
+            self._cutoff = False
+            try:
+                best_eval, best_cell = self.search_root(depth, best_cell)
+            except SearchTimeout:
+                while self.board.moves:
+                    self.board.undo()
+                break
+            self.depth_reached = depth
+            if not self._cutoff:
+                break
+            depth += 1
+
+        return best_eval, divmod(best_cell, self.size)
+
+_worker_search = None
+_worker_depth = None
+
+
+def _init_worker(size, x, o, table_bits, shared_alpha):
+    global _worker_search
+    game = BitboardTicTacToe(size)
+    game.bits[PLAYER_X], game.bits[PLAYER_O] = x, o
+    search = AlphaBetaSearch(game, None, table_bits)
+    search.shared_alpha = shared_alpha
+    _worker_search = (search, shared_alpha)
+
+
+def _worker_root_move(cell, max_depth, deadline):
+    """Ocena jednego ruchu w korzeniu ze wspólnym alfa; zwraca (pole, ocena, alfa, cięcie, węzły).
+
+    Alfa jest odczytywane na starcie i ponownie co CHECK_EVERY węzłów, więc lepsze
+    ograniczenie znalezione w innym procesie przycina też zadania już trwające.
+    """
+    global _worker_depth
+    search, shared_alpha = _worker_search
+    if max_depth != _worker_depth and search.table is not None:
+        search.table.new_iteration()
+        _worker_depth = max_depth
+    alpha = search.root_alpha = shared_alpha.value
+    nodes = search.nodes
+    search._cutoff = False
+    search.deadline = None if deadline is None else time.perf_counter() + deadline - time.time()
+    try:
+        eval = search.search_move(cell, max_depth, alpha)
+    except SearchTimeout:
+        while search.board.moves:
+            search.board.undo()
+        return cell, None, alpha, True, search.nodes - nodes
+    # Wynik jest dokładny tylko powyżej najwyższego alfa, z jakim liczono poddrzewo
+    alpha = search.root_alpha
+
+    if eval > alpha:
+        with shared_alpha.get_lock():
+            if eval > shared_alpha.value:
+                shared_alpha.value = eval
+    return cell, eval, alpha, search._cutoff, search.nodes - nodes
+
+
+class ParallelAlphaBetaSearch:
+    """Równoległe przeszukiwanie korzenia: ruchy O są rozdzielane między procesy puli.
+
+    Najpierw liczony jest najstarszy brat (najlepszy ruch poprzedniej iteracji),
+    a dopiero potem pozostałe ruchy równolegle (young brothers wait). Najlepsza
+    dotąd dokładna ocena jest wspólną wartością alfa, którą zadania odczytują
+    na starcie i w trakcie liczenia, więc poddrzewa są przycinane jak w wersji
+    szeregowej. Każdy proces ma własną tablicę transpozycji i ruchy-zabójców.
+    """
+
+    def __init__(self, game, time_limit=None, table_bits=AlphaBetaSearch.TABLE_BITS, processes=None):
+        game = as_bitboard(game)
+        self.game = game
+        self.size = game.size
+        self.table_bits = table_bits
+        self.processes = processes or os.cpu_count() or 1
+        self.deadline = None if time_limit is None else time.time() + time_limit
+        self.nodes = 0
+        self.depth_reached = None
+
+    def search_root(self, pool, shared_alpha, max_depth, moves):
+        """Jedna iteracja; zwraca (ocena, pole, czy było cięcie głębokości) albo None po przekroczeniu czasu."""
+        shared_alpha.value = -math.inf
+        results = [pool.submit(_worker_root_move, moves[0], max_depth, self.deadline).result()]
+        futures = [pool.submit(_worker_root_move, cell, max_depth, self.deadline) for cell in moves[1:]]
+        results += [future.result() for future in futures]
+
+        self.nodes += sum(result[4] for result in results)
+        if any(result[1] is None for result in results):
+            return None
+        # Wynik nie większy od alfa, z którym liczono ruch, jest tylko ograniczeniem -
+        # taki ruch nie jest lepszy od któregoś z policzonych dokładnie.
+        exact = [(eval, -index, cell) for index, (cell, eval, alpha, _, _) in enumerate(results) if eval > alpha]
+        best_eval, _, best_cell = max(exact)
+        return best_eval, best_cell, any(result[3] for result in results)
+
+    def run(self, max_depth=MAX_DEPTH_INF):
+        """Pogłębianie iteracyjne jak w `AlphaBetaSearch.run`; zwraca (ocena, (wiersz, kolumna))."""
+        if self.game.is_terminal():
+            return None, None
+
+        occupied = self.game.bits[PLAYER_X] | self.game.bits[PLAYER_O]
+        moves = [cell for cell in SearchBoard(self.game).order if not occupied >> cell & 1]
+        best_eval, best_cell = None, moves[0]
+        shared_alpha = multiprocessing.Value('d', -math.inf)
+        initargs = (self.size, self.game.bits[PLAYER_X], self.game.bits[PLAYER_O], self.table_bits, shared_alpha)
+        with ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=initargs) as pool:
+            depth = 0
+            while depth <= max_depth:
+                moves.remove(best_cell)
+                moves.insert(0, best_cell)
+                result = self.search_root(pool, shared_alpha, depth, moves)
+                if result is None:
+                    break
+                best_eval, best_cell, cutoff = result
+                self.depth_reached = depth
+                if not cutoff:
+                    break
+                depth += 1
+
+        return best_eval, divmod(best_cell, self.size)
+
+
+def find_best_move(game, max_depth, time_limit=None, processes=None):
+    """Najlepszy ruch O; po upływie `time_limit` sekund zwraca najlepszy ruch z ostatniej pełnej iteracji.
+
+    Przy `processes` > 1 ruchy w korzeniu są liczone równolegle.
+    """
+    if processes and processes > 1:
+        return ParallelAlphaBetaSearch(game, time_limit, processes=processes).run(max_depth)[1]
+    return AlphaBetaSearch(game, time_limit).run(max_depth)[1]
 
 def play_game():
 
@@ -121,9 +673,8 @@ def play_game():
 
         default_depth = MAX_DEPTH_INF 
         if board_size > 3:
-            default_depth = 4 
             print(f"\nINFO: Plansza {board_size}x{board_size} jest duża.")
-            print(f"Używamy domyślnego limitu głębokości Minimax: {default_depth} (dla optymalizacji czasu).")
+            print("Komputer pogłębia przeszukiwanie, dopóki nie skończy mu się czas na ruch.")
         
         depth_label = 'bez limitu' if default_depth == MAX_DEPTH_INF else str(int(default_depth))
         depth_input = input(f"Podaj max głębokość algorytmu Minimax (domyślnie: {depth_label}): ")
@@ -133,6 +684,14 @@ def play_game():
         else:
             max_depth = default_depth
 
+        time_input = input(f"Podaj limit czasu na ruch komputera w sekundach (domyślnie: {DEFAULT_TIME_LIMIT:g}): ")
+        try:
+            time_limit = float(time_input) if time_input.strip() else DEFAULT_TIME_LIMIT
+        except ValueError:
+            time_limit = DEFAULT_TIME_LIMIT
+        if time_limit <= 0:
+            time_limit = DEFAULT_TIME_LIMIT
+
         first_player_input = input("Kto zaczyna? (Ty / Komputer, domyślnie: Ty): ").lower().strip()
         
         user_char = PLAYER_X
@@ -145,7 +704,7 @@ def play_game():
             current_turn = user_char
             print("Zaczynasz Ty (X).")
 
-        game = TicTacToe(size=board_size)
+        game = BitboardTicTacToe(size=board_size)
 
     except ValueError as e:
         print(f"Błąd konfiguracji: {e}")
@@ -171,14 +730,15 @@ def play_game():
 
         else:
             depth_info = "pełna" if max_depth == MAX_DEPTH_INF else f"{int(max_depth)}"
-            print(f"Ruch Komputera ({comp_char}). Analizuję (Głębokość: {depth_info})...")
+            print(f"Ruch Komputera ({comp_char}). Analizuję (Głębokość: {depth_info}, limit czasu: {time_limit:g} s)...")
             
-            comp_move = find_best_move(game, max_depth)
+            search = AlphaBetaSearch(game, time_limit)
+            _, comp_move = search.run(max_depth)
             
             if comp_move:
                 row, col = comp_move
                 game.make_move(row, col, comp_char)
-                print(f"Komputer zagrał wiersz {row}, kolumna {col}.")
+                print(f"Komputer zagrał wiersz {row}, kolumna {col} (osiągnięta głębokość: {search.depth_reached}).")
             else:
                 print("Błąd: Komputer nie znalazł ruchu.")
                 break 
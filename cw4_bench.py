@@ -0,0 +1,147 @@
+import argparse
+import json
+import math
+import time
+
+import cw4
+
+# (rozmiar planszy, głębokości); None oznacza pełną głębokość
+DEFAULT_CASES = [(3, [None]), (4, [4, 5, 6, 7, 8])]
+
+# Stały zestaw pozycji: (nazwa, rozmiar, ruchy na przemian od X, głębokość). Zawsze ruch ma O.
+SUITE = [
+    ("3x3-pusta", 3, [], None),
+    ("3x3-rog", 3, [(0, 0)], None),
+    ("3x3-srodek", 3, [(1, 1), (0, 0), (2, 2)], None),
+    ("4x4-pusta", 4, [], 8),
+    ("4x4-gra", 4, [(1, 1), (2, 2), (0, 1)], 9),
+    ("5x5-pusta", 5, [], 6),
+    ("5x5-gra", 5, [(2, 2), (1, 1), (2, 3)], 6),
+    ("6x6-pusta", 6, [], 5),
+    ("6x6-gra", 6, [(2, 2), (3, 3), (2, 3)], 5),
+]
+# Krótszych pomiarów nie porównujemy pod względem węzłów/s - za duży szum.
+MIN_TIMED_SECONDS = 0.05
+
+
+def count_nodes(size, depth, table_bits):
+    """Przeszukuje pustą planszę na stałą głębokość; zwraca (ocena, ruch, węzły, czas w sekundach)."""
+    search = cw4.AlphaBetaSearch(cw4.BitboardTicTacToe(size), table_bits=table_bits)
+    start = time.perf_counter()
+    value, cell = search.search_root(math.inf if depth is None else depth)
+    elapsed = time.perf_counter() - start
+    return value, divmod(cell, size), search.nodes, elapsed
+
+
+def compare_parallel(size, depth, processes):
+    """Pogłębianie iteracyjne do `depth` szeregowo i w `processes` procesach: węzły, węzły/s i przyspieszenie."""
+    timings = []
+    for label, search in (("szeregowo", cw4.AlphaBetaSearch(cw4.BitboardTicTacToe(size))),
+                          (f"{processes} procesy", cw4.ParallelAlphaBetaSearch(cw4.BitboardTicTacToe(size),
+                                                                                 processes=processes))):
+        start = time.perf_counter()
+        value, move = search.run(depth)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        print(f"{label:>12}: {elapsed:7.2f} s, węzły={search.nodes} ({search.nodes / elapsed:,.0f}/s), "
+              f"ocena={value:.3g} ruch={move}")
+    print(f"przyspieszenie: {timings[0] / timings[1]:.2f}x")
+
+
+def suite_position(size, moves):
+    game = cw4.BitboardTicTacToe(size)
+    for i, (row, col) in enumerate(moves):
+        game.make_move(row, col, cw4.PLAYER_X if i % 2 == 0 else cw4.PLAYER_O)
+    return game
+
+
+def run_suite(table_bits, repeat):
+    """Przeszukuje pozycje z SUITE na stałą głębokość; czas to najlepszy z `repeat` przebiegów."""
+    results = []
+    for name, size, moves, depth in SUITE:
+        best = math.inf
+        for _ in range(repeat):
+            search = cw4.AlphaBetaSearch(suite_position(size, moves), table_bits=table_bits)
+            start = time.perf_counter()
+            value, cell = search.search_root(math.inf if depth is None else depth)
+            best = min(best, time.perf_counter() - start)
+        results.append({"name": name, "size": size, "depth": depth, "nodes": search.nodes, "seconds": best,
+                        "nps": round(search.nodes / best), "move": list(divmod(cell, size)), "eval": value})
+        label = "pełna" if depth is None else str(depth)
+        print(f"{name:>12} {label:>5} {search.nodes:>9} {search.nodes / best:>12,.0f}/s "
+              f"{best:>7.3f}s  ocena={value:.4g} ruch={tuple(results[-1]['move'])}")
+    return results
+
+
+def compare_baseline(results, baseline, tolerance):
+    """Zwraca listę opisów zmian względem linii bazowej: liczby węzłów, ruchu, oceny i spadku węzłów/s."""
+    problems = []
+    previous = {entry["name"]: entry for entry in baseline["results"]}
+    for result in results:
+        name = result["name"]
+        old = previous.get(name)
+        if old is None:
+            problems.append(f"{name}: brak w linii bazowej")
+            continue
+        if result["nodes"] != old["nodes"]:
+            problems.append(f"{name}: liczba węzłów {old['nodes']} -> {result['nodes']}")
+        if result["move"] != old["move"] or result["eval"] != old["eval"]:
+            problems.append(f"{name}: ruch/ocena {tuple(old['move'])} {old['eval']} -> "
+                            f"{tuple(result['move'])} {result['eval']}")
+        timed = min(result["seconds"], old["seconds"]) >= MIN_TIMED_SECONDS
+        if timed and result["nps"] < old["nps"] * (1 - tolerance):
+            problems.append(f"{name}: węzły/s {old['nps']:,} -> {result['nps']:,} "
+                            f"({result['nps'] / old['nps'] - 1:+.0%})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Liczba węzłów alfa-bety w cw4 bez i z tablicą transpozycji oraz pomiar wersji równoległej.")
+    parser.add_argument('--table-bits', type=int, default=cw4.AlphaBetaSearch.TABLE_BITS,
+                        help="rozmiar tablicy transpozycji jako potęga dwójki")
+    parser.add_argument('--parallel', type=int, metavar='PROCESY',
+                        help="zamiast tabeli porównaj przeszukiwanie szeregowe z równoległym")
+    parser.add_argument('--size', type=int, default=4, help="rozmiar planszy dla --parallel (domyślnie 4)")
+    parser.add_argument('--depth', type=int, default=10, help="głębokość dla --parallel (domyślnie 10)")
+    parser.add_argument('--suite', action='store_true',
+                        help="zamiast tabeli przeszukaj stały zestaw pozycji 3x3-6x6")
+    parser.add_argument('--repeat', type=int, default=3, help="liczba przebiegów każdej pozycji w --suite")
+    parser.add_argument('--save-baseline', metavar='PLIK', help="zapisz wyniki --suite jako linię bazową JSON")
+    parser.add_argument('--baseline', metavar='PLIK', help="porównaj wyniki --suite z linią bazową JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="dopuszczalny spadek węzłów/s względem linii bazowej (domyślnie 0.25)")
+    args = parser.parse_args()
+
+    if args.suite or args.save_baseline or args.baseline:
+        results = run_suite(args.table_bits, args.repeat)
+        if args.save_baseline:
+            with open(args.save_baseline, 'w', encoding='utf-8') as f:
+                json.dump({"table_bits": args.table_bits, "results": results}, f, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                problems = compare_baseline(results, json.load(f), args.tolerance)
+            for problem in problems:
+                print(f"ZMIANA: {problem}")
+            print(f"zgodność z linią bazową: {'NIE' if problems else 'tak'}")
+            raise SystemExit(1 if problems else 0)
+        return
+
+    if args.parallel:
+        compare_parallel(args.size, args.depth, args.parallel)
+        return
+
+    print(f"{'plansza':>7} {'głęb.':>5} {'bez TT':>10} {'z TT':>10} {'redukcja':>8} "
+          f"{'czas bez':>9} {'czas z':>9}    ocena ruch")
+    for size, depths in DEFAULT_CASES:
+        for depth in depths:
+            value, move, plain_nodes, plain_time = count_nodes(size, depth, None)
+            table_value, table_move, table_nodes, table_time = count_nodes(size, depth, args.table_bits)
+            label = "pełna" if depth is None else str(depth)
+            mark = "" if table_value == value else f"  ROZBIEŻNOŚĆ: z TT {table_value}"
+            print(f"{size}x{size:<5} {label:>5} {plain_nodes:>10} {table_nodes:>10} "
+                  f"{plain_nodes / table_nodes:>7.1f}x {plain_time:>8.2f}s {table_time:>8.2f}s  "
+                  f"{value:>7.3g} {move}{mark}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import math
+import random
+from array import array
+
+import pytest
+
+from cw2_search import CSRGraph, ContractionHierarchy, dijkstra, search_stats
+
+
+def random_graph(n: int, edges: int, directed: bool, seed: int) -> CSRGraph:
+    """Losowy graf o `n` węzłach; długości krawędzi to małe liczby całkowite, żeby było dużo remisów."""
+    rng = random.Random(seed)
+    adjacency = [dict() for _ in range(n)]
+    for _ in range(edges):
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a == b:
+            continue
+        length = float(rng.randint(1, 5))
+        adjacency[a][b] = length
+        if not directed:
+            adjacency[b][a] = length
+    offsets, targets, lengths = array('i', [0]), array('i'), array('d')
+    for neighbors in adjacency:
+        targets.extend(neighbors)
+        lengths.extend(neighbors.values())
+        offsets.append(len(targets))
+    coords = array('d', (rng.uniform(0, 100) for _ in range(n)))
+    return CSRGraph(array('l', range(1, n + 1)), coords, coords[::-1], offsets, targets, lengths)
+
+
+def path_length(csr: CSRGraph, path):
+    total = 0.0
+    for a, b in zip(path, path[1:]):
+        i = csr.index_of(a)
+        edges = range(csr.offsets[i], csr.offsets[i + 1])
+        total += min((csr.lengths[e] for e in edges if csr.ids[csr.targets[e]] == b), default=math.inf)
+    return total
+
+
+def assert_matches_dijkstra(csr: CSRGraph, hierarchy: ContractionHierarchy):
+    for source in range(len(csr)):
+        dist = dijkstra(csr, source)
+        for target in range(len(csr)):
+            path, cost, _ = search_stats(csr, csr.ids[source], csr.ids[target], "CH", hierarchy=hierarchy)
+            if math.isinf(dist[target]):
+                assert path is None, (source, target)
+                continue
+            assert path is not None, (source, target)
+            assert cost == pytest.approx(dist[target]), (source, target)
+            assert path[0] == csr.ids[source] and path[-1] == csr.ids[target]
+            assert path_length(csr, path) == pytest.approx(cost), (source, target)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_hierarchy_matches_dijkstra(directed, seed):
+    csr = random_graph(30, 70, directed, seed)
+    assert_matches_dijkstra(csr, ContractionHierarchy.build(csr))
+
+
+def test_hierarchy_on_disconnected_graph():
+    csr = random_graph(25, 12, True, 7)
+    assert_matches_dijkstra(csr, ContractionHierarchy.build(csr))
+
+
+def test_cached_hierarchy_matches_dijkstra(tmp_path):
+    pytest.importorskip("numpy")
+    csr = random_graph(30, 70, True, 11)
+    graph_file = tmp_path / "graph.txt"
+    graph_file.write_text("30\n")
+    built = ContractionHierarchy.load_or_compute(csr, str(graph_file))
+    assert (tmp_path / "graph.txt.ch.npz").exists()
+    cached = ContractionHierarchy.load_or_compute(csr, str(graph_file))
+    assert list(cached.rank) == list(built.rank)
+    assert_matches_dijkstra(csr, cached)
+
+
+TRUNCATED_GRAPH = "3\n0 0\n1 1\n2 2\n1 2\n"
+
+
+def test_truncated_adjacency_is_rejected(tmp_path):
+    pytest.importorskip("numpy")
+    graph_file = tmp_path / "graph.txt"
+    graph_file.write_text(TRUNCATED_GRAPH)
+    with pytest.raises(ValueError):
+        CSRGraph.load_from_file(str(graph_file))
+    assert not (tmp_path / "graph.txt.csr.npz").exists()
+
+
+def test_truncated_adjacency_is_rejected_without_numpy(tmp_path):
+    graph_file = tmp_path / "graph.txt"
+    graph_file.write_text(TRUNCATED_GRAPH)
+    with pytest.raises(ValueError):
+        CSRGraph._parse_text(str(graph_file))